@@ -15,7 +15,7 @@ import torch
 import pandas as pd
 import mlflow
 from tqdm import tqdm
-from omegaconf import OmegaConf
+from omegaconf import OmegaConf, open_dict
 from nemo.collections.asr.models import ASRModel
 from nemo.utils import logging, model_utils
 from nemo.utils.get_rank import is_global_rank_zero
@@ -53,6 +53,10 @@ class ASRTrainer:
         
         # Update tokenizer configuration
         self.update_config()
+        OmegaConf.set_struct(self.config, True)
+        
+        # Resolve the model config once and reuse it for every dataloader setup
+        self._resolved_cfg = model_utils.convert_model_config_to_dict_config(self.config)
     
     def update_config(self):
         """Update configuration with runtime settings."""
@@ -89,19 +93,23 @@ class ASRTrainer:
             logging.info(f"Loading model from: {model_path}")
             asr_model = ASRModel.restore_from(restore_path=model_path)
         else:
-            # Handle multi-GPU download efficiently
+            # Handle multi-GPU download efficiently: each rank loads the model exactly once
             num_ranks = trainer.num_devices * trainer.num_nodes if hasattr(trainer, 'num_nodes') else trainer.num_devices
+            dist_ready = num_ranks > 1 and torch.distributed.is_available() and torch.distributed.is_initialized()
 
-            if num_ranks > 1 and is_global_rank_zero():
+            if is_global_rank_zero():
                 logging.info(f"Downloading pretrained model '{pretrained_name}' on main process")
                 asr_model = ASRModel.from_pretrained(model_name=pretrained_name)
+                if dist_ready:
+                    torch.distributed.barrier()
             else:
-                # Wait for model download to complete on main process
-                wait_time = 1 if is_global_rank_zero() else 60
-                logging.info(f"Waiting {wait_time}s for model download")
-                time.sleep(wait_time)
+                # Wait for model download to complete on main process, then load from cache
+                if dist_ready:
+                    torch.distributed.barrier()
+                else:
+                    logging.info("Waiting 60s for model download")
+                    time.sleep(60)
                 asr_model = ASRModel.from_pretrained(model_name=pretrained_name)
-        asr_model.to(f"cuda:{int(os.environ.get('LOCAL_RANK', 0))}")
         # Unfreezing encoders to update the parameters
         asr_model.encoder.unfreeze()
         logging.info("Model encoder has been un-frozen")
@@ -148,6 +156,22 @@ class ASRTrainer:
         
         return asr_model
     
+    @staticmethod
+    def tune_dataloader_config(ds_cfg, num_devices):
+        """
+        Size the training loader's worker pool to the host CPUs available per device.
+        
+        Only num_workers and pin_memory are set: NeMo's RNNT _setup_dataloader_from_config
+        builds the DataLoader from those two keys and ignores persistent_workers/prefetch_factor.
+        
+        Args:
+            ds_cfg: Dataset config (e.g. model.train_ds) passed to NeMo
+            num_devices: Number of devices per node sharing the host CPUs
+        """
+        with open_dict(ds_cfg):
+            ds_cfg.num_workers = max(ds_cfg.get('num_workers', 0) or 0, (os.cpu_count() or 1) // max(num_devices, 1), 4)
+            ds_cfg.pin_memory = True
+    
     def setup_dataloaders(self, asr_model):
         """
         Set up training, validation and test dataloaders.
@@ -158,7 +182,12 @@ class ASRTrainer:
         Returns:
             ASR model with dataloaders configured
         """
-        cfg = model_utils.convert_model_config_to_dict_config(self.config)
+        cfg = self._resolved_cfg
+        
+        # Give the training loader as many workers as the CPUs per device allow; validation
+        # loaders keep their configured worker count so each rank doesn't double its processes
+        num_devices = asr_model.trainer.num_devices if asr_model.trainer is not None else 1
+        self.tune_dataloader_config(cfg.model.train_ds, num_devices)
         
         # Setup training data
         asr_model.setup_training_data(cfg.model.train_ds)
@@ -234,6 +263,16 @@ class ASRTrainer:
         # Setup optimization
         asr_model.setup_optimization(self.config.model.optim)
         
+        # Compile encoder/decoder so Inductor can fuse pointwise ops (Ampere or newer)
+        if self.config.trainer.get('compile', False) and torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 8:
+            torch._dynamo.config.cache_size_limit = 64
+            # Compile in place rather than wrapping in OptimizedModule, so state dict keys
+            # (and the .nemo saved below) keep their plain encoder.*/decoder.* names.
+            # dynamic=True because ASR batches have variable sequence length
+            asr_model.encoder.compile(mode='reduce-overhead', dynamic=True)
+            asr_model.decoder.compile(mode='reduce-overhead', dynamic=True)
+            logging.info("Model encoder and decoder compiled with torch.compile")
+        
         # Setup SpecAug if available
         if hasattr(self.config.model, 'spec_augment') and self.config.model.spec_augment is not None:
             asr_model.spec_augment = ASRModel.from_config_dict(self.config.model.spec_augment)
@@ -7,9 +7,12 @@ import streamlit as st
 import os
 import json
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import hmac
 import hashlib
 import base64
+from functools import lru_cache
 from typing import Optional, Dict, Any
 import requests
 from datetime import datetime
@@ -26,211 +29,78 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
-<style>
-    /* Main header styling */
-    .main-header {
-        font-size: 3rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #FF9933 0%, #FF6B35 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 1rem;
-        padding: 1rem 0;
-    }
-    
-    .subtitle {
-        text-align: center;
-        font-size: 1.2rem;
-        color: #6c757d;
-        margin-bottom: 3rem;
-    }
-    
-    /* Login container */
-    .login-container {
-        max-width: 450px;
-        margin: 0 auto;
-        padding: 2.5rem;
-        background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
-        border-radius: 15px;
-        box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-        border: 1px solid #e9ecef;
-    }
-    
-    /* Mode selector cards */
-    .mode-card {
-        padding: 2rem;
-        border-radius: 15px;
-        background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
-        margin: 1rem 0;
-        border: 2px solid #e9ecef;
-        transition: all 0.3s ease;
-        box-shadow: 0 5px 15px rgba(0, 0, 0, 0.08);
-        height: 100%;
-    }
-    
-    .mode-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 15px 35px rgba(0, 0, 0, 0.15);
-        border-color: #FF9933;
-    }
-    
-    .mode-card-lite {
-        border-left: 5px solid #17a2b8;
-    }
-    
-    .mode-card-regular {
-        border-left: 5px solid #FF6B35;
-    }
-    
-    .mode-title {
-        font-size: 1.5rem;
-        font-weight: 600;
-        margin-bottom: 1rem;
-        color: #2c3e50;
-    }
-    
-    .mode-description {
-        font-size: 1rem;
-        color: #6c757d;
-        margin-bottom: 1.5rem;
-        line-height: 1.6;
-    }
-    
-    .feature-list {
-        margin: 1.5rem 0;
-    }
-    
-    .feature-item {
-        padding: 0.5rem 0;
-        font-size: 0.95rem;
-        color: #495057;
-    }
-    
-    .best-for {
-        background-color: #f0f8ff;
-        padding: 1rem;
-        border-radius: 8px;
-        margin-top: 1rem;
-        border-left: 3px solid #17a2b8;
-    }
-    
-    .best-for-title {
-        font-weight: 600;
-        color: #2c3e50;
-        margin-bottom: 0.5rem;
-    }
-    
-    /* Hero section */
-    .hero-section {
-        text-align: center;
-        padding: 2rem 0;
-        margin-bottom: 2rem;
-    }
-    
-    .hero-icon {
-        font-size: 4rem;
-        margin-bottom: 1rem;
-    }
-    
-    /* Stats cards */
-    .stats-container {
-        display: flex;
-        justify-content: space-around;
-        margin: 2rem 0;
-        gap: 1rem;
-    }
-    
-    .stat-card {
-        flex: 1;
-        padding: 1.5rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 10px;
-        text-align: center;
-        color: white;
-        box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
-    }
-    
-    .stat-number {
-        font-size: 2rem;
-        font-weight: 700;
-        margin-bottom: 0.5rem;
-    }
-    
-    .stat-label {
-        font-size: 0.9rem;
-        opacity: 0.9;
-    }
-    
-    /* Success and error boxes */
-    .success-box {
-        padding: 1rem;
-        border-radius: 10px;
-        background-color: #d4edda;
-        border-left: 4px solid #28a745;
-        color: #155724;
-        margin: 1rem 0;
-    }
-    
-    .error-box {
-        padding: 1rem;
-        border-radius: 10px;
-        background-color: #f8d7da;
-        border-left: 4px solid #dc3545;
-        color: #721c24;
-        margin: 1rem 0;
-    }
-    
-    /* Sidebar styling */
-    .sidebar-info {
-        padding: 1rem;
-        background-color: #f8f9fa;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    
-    /* Button enhancements */
-    .stButton>button {
-        border-radius: 8px;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 5px 15px rgba(0, 0, 0, 0.2);
+
+@st.cache_data
+def _load_css() -> str:
+    """Load the app stylesheet once and reuse it across reruns"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'styles.css'), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@st.cache_data
+def _get_cognito_settings() -> Dict[str, Optional[str]]:
+    """Read Cognito settings from the environment once per process"""
+    return {
+        'client_id': os.getenv('COGNITO_CLIENT_ID'),
+        'client_secret': os.getenv('COGNITO_CLIENT_SECRET'),
+        'user_pool_id': os.getenv('COGNITO_USER_POOL_ID'),
+        'region': os.getenv('AWS_REGION', 'us-east-1'),
     }
-</style>
-""", unsafe_allow_html=True)
+
+
+@st.cache_resource
+def _get_cognito_client(region: str):
+    """Build the Cognito client once per process instead of on every rerun"""
+    return boto3.client(
+        'cognito-idp',
+        region_name=region,
+        config=Config(retries={'mode': 'adaptive', 'max_attempts': 3}, tcp_keepalive=True)
+    )
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _validate_access_token(token_hash: str, region: str, _access_token: str) -> bool:
+    """Check an access token against Cognito, cached briefly by token hash"""
+    try:
+        _get_cognito_client(region).get_user(AccessToken=_access_token)
+        return True
+    except ClientError as e:
+        # Only a rejected token is invalid; let transient failures surface to the caller
+        if e.response.get('Error', {}).get('Code') == 'NotAuthorizedException':
+            return False
+        raise
+
+
+@lru_cache(maxsize=128)
+def _secret_hash(username: str, client_id: str, client_secret: str) -> str:
+    """Compute the Cognito secret hash once per user per process"""
+    dig = hmac.digest(client_secret.encode('utf-8'), (username + client_id).encode('utf-8'), 'sha256')
+    return base64.b64encode(dig).decode()
 
 
 class CognitoAuth:
     """Handle Cognito authentication"""
     
     def __init__(self):
-        self.client_id = os.getenv('COGNITO_CLIENT_ID')
-        self.client_secret = os.getenv('COGNITO_CLIENT_SECRET')
-        self.user_pool_id = os.getenv('COGNITO_USER_POOL_ID')
-        self.region = os.getenv('AWS_REGION', 'us-east-1')
+        settings = _get_cognito_settings()
+        self.client_id = settings['client_id']
+        self.client_secret = settings['client_secret']
+        self.user_pool_id = settings['user_pool_id']
+        self.region = settings['region']
         
         if not all([self.client_id, self.user_pool_id]):
             st.warning("⚠️ Cognito not configured. Running in development mode.")
             self.enabled = False
         else:
             self.enabled = True
-            self.cognito_client = boto3.client('cognito-idp', region_name=self.region)
+            self.cognito_client = _get_cognito_client(self.region)
     
     def get_secret_hash(self, username: str) -> str:
         """Generate secret hash for Cognito"""
         if not self.client_secret:
             return None
         
-        message = bytes(username + self.client_id, 'utf-8')
-        secret = bytes(self.client_secret, 'utf-8')
-        dig = hmac.new(secret, message, hashlib.sha256).digest()
-        return base64.b64encode(dig).decode()
+        return _secret_hash(username, self.client_id, self.client_secret)
     
     def authenticate(self, username: str, password: str) -> Dict[str, Any]:
         """Authenticate user with Cognito"""
@@ -270,11 +140,9 @@ class CognitoAuth:
         if not self.enabled:
             return True
         
-        try:
-            self.cognito_client.get_user(AccessToken=access_token)
-            return True
-        except:
-            return False
+        # Key the cache on a digest so the raw token never lands in Streamlit's cache
+        token_hash = hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+        return _validate_access_token(token_hash, self.region, access_token)
 
 
 class MigrationAdvisorApp:
@@ -488,12 +356,16 @@ class MigrationAdvisorApp:
         st.session_state.user = None
         st.session_state.mode = None
         st.session_state.tokens = None
+        _validate_access_token.clear()
         # Clear query params
         st.query_params.clear()
         st.rerun()
     
     def run(self):
         """Main application entry point"""
+        # Custom CSS
+        st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
+        
         if not st.session_state.authenticated:
             self.render_login_page()
         elif st.session_state.mode is None:
@@ -3,7 +3,10 @@ Diagram Generator Component for SageMaker Migration Advisor
 Handles architecture diagram generation using AWS Diagram MCP Server
 """
 
+import atexit
+import logging
 import os
+import threading
 from typing import Dict, Any, List
 from strands import Agent
 from strands.tools.mcp import MCPClient
@@ -12,10 +15,131 @@ from strands_tools import image_reader, use_llm, load_tool
 from logger_config import logger
 
 
+# File extensions treated as generated diagrams, in both cases so the
+# per-entry filter can skip allocating a lowercased name
+DIAGRAM_EXTENSIONS = ('.png', '.PNG', '.jpg', '.JPG', '.jpeg', '.JPEG', '.gif', '.GIF', '.svg', '.SVG')
+
+# Shared MCP server connection, started on first use and reused across generators.
+# _generation_lock serializes diagram runs on the shared server (across all sessions in
+# the process) and must be held to fetch, health-check or reset it; _mcp_lock guards the
+# client globals themselves.
+_mcp_lock = threading.Lock()
+_generation_lock = threading.Lock()
+_mcp_client = None
+_mcp_tools = None
+
+# How the diagram MCP server is launched
+_MCP_SERVER = StdioServerParameters(
+    command="uvx",
+    args=["awslabs.aws-diagram-mcp-server"]
+)
+
+
+def _close_mcp_client_locked():
+    """Shut down the shared MCP server connection; caller must hold _mcp_lock"""
+    global _mcp_client, _mcp_tools
+    if _mcp_client is not None:
+        try:
+            _mcp_client.__exit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"Error closing MCP client: {e}")
+        _mcp_client = None
+        _mcp_tools = None
+
+
+def _get_mcp_tools() -> list:
+    """
+    Return the shared diagram MCP server's tools, (re)starting the server when needed.
+    
+    A cached connection is pinged first: strands reports MCP tool failures as error
+    tool results rather than exceptions, so a dead server would otherwise stay cached.
+    Caller must hold _generation_lock.
+    
+    Returns:
+        List of MCP tools exposed by the AWS Diagram MCP Server
+    """
+    global _mcp_client, _mcp_tools
+    with _mcp_lock:
+        if _mcp_client is not None:
+            try:
+                _mcp_client.list_tools_sync()
+            except Exception as e:
+                logger.warning(f"Shared MCP server is not responding, restarting it: {e}")
+                _close_mcp_client_locked()
+        
+        if _mcp_client is None:
+            logger.info("Initializing MCP client for diagram generation")
+            client = MCPClient(lambda: stdio_client(_MCP_SERVER))
+            client.__enter__()
+            try:
+                tools = client.list_tools_sync()
+            except Exception:
+                client.__exit__(None, None, None)
+                raise
+            _mcp_client, _mcp_tools = client, tools
+        return _mcp_tools
+
+
+def _reset_mcp_client():
+    """Shut down the shared MCP server connection; caller must hold _generation_lock"""
+    with _mcp_lock:
+        _close_mcp_client_locked()
+
+
+def _mcp_tool_failed(messages: List[Dict[str, Any]], mcp_tool_names: set) -> bool:
+    """Check an agent conversation for error results returned by MCP tools"""
+    mcp_tool_use_ids = set()
+    for message in messages:
+        for block in message.get('content', []):
+            if 'toolUse' in block and block['toolUse'].get('name') in mcp_tool_names:
+                mcp_tool_use_ids.add(block['toolUse'].get('toolUseId'))
+            elif 'toolResult' in block:
+                result = block['toolResult']
+                if result.get('status') == 'error' and result.get('toolUseId') in mcp_tool_use_ids:
+                    return True
+    return False
+
+
+def prefetch_mcp_tools():
+    """Start (or health-check) the shared MCP server on a background thread so tools are ready on first use"""
+    def _prefetch():
+        # A diagram run in progress checks the server itself; don't queue behind it
+        if not _generation_lock.acquire(blocking=False):
+            return
+        try:
+            _get_mcp_tools()
+        except Exception as e:
+            logger.warning(f"MCP tool prefetch failed, will retry on first use: {e}")
+        finally:
+            _generation_lock.release()
+    
+    threading.Thread(target=_prefetch, name="mcp-tool-prefetch", daemon=True).start()
+
+
+def close_mcp_client():
+    """Shut down the shared MCP server connection once no diagram run is using it"""
+    with _generation_lock:
+        _reset_mcp_client()
+
+
+def _close_mcp_client_at_exit():
+    """Close the shared connection at exit without hanging on a run stuck in a daemon thread"""
+    acquired = _generation_lock.acquire(timeout=5)
+    try:
+        _reset_mcp_client()
+    finally:
+        if acquired:
+            _generation_lock.release()
+
+
+atexit.register(_close_mcp_client_at_exit)
+
+
 class DiagramGenerator:
     """Handles diagram generation using MCP server with proper workspace management"""
     
-    def __init__(self, workspace_dir: str, bedrock_model, system_prompt: str, user_prompt: str):
+    def __init__(self, workspace_dir: str, bedrock_model, system_prompt: str, user_prompt: str,
+                 prefetch_tools: bool = True):
         """
         Initialize DiagramGenerator with workspace directory
         
@@ -24,9 +148,10 @@ class DiagramGenerator:
             bedrock_model: Bedrock model instance for AI generation
             system_prompt: System prompt for diagram generation agent
             user_prompt: User prompt template for diagram generation
+            prefetch_tools: Start MCP tool discovery in the background (disable when only listing files)
         """
         # Use /tmp for ECS/Fargate compatibility, fallback to workspace_dir
-        if os.path.exists('/tmp') and os.access('/tmp', os.W_OK):
+        if os.access('/tmp', os.W_OK):
             self.workspace_dir = '/tmp'
             logger.info("Using /tmp for diagram storage (ECS/Fargate compatible)")
         else:
@@ -37,7 +162,25 @@ class DiagramGenerator:
         self.system_prompt = system_prompt
         self.user_prompt = user_prompt
         self.diagram_folder = os.path.join(self.workspace_dir, 'generated-diagrams')
+        # File sizes captured during the last directory scan, keyed by path
+        self._diagram_sizes: Dict[str, int] = {}
+        # (folder mtime_ns, files) from the last scan, reused while the folder is unchanged
+        self._listing_cache = (None, None)
+        # Static part of the generation prompt; only the design text varies per call
+        self._prompt_tail = f"""
+
+{self.user_prompt}
+
+CRITICAL INSTRUCTIONS:
+- Save all diagrams to the workspace directory: {self.workspace_dir}
+- Use the workspace_dir parameter when calling diagram generation tools
+- Ensure diagrams are saved to: {self.diagram_folder}
+- Generate clear, professional architecture diagrams
+"""
         self._ensure_diagram_folder()
+        
+        if prefetch_tools:
+            prefetch_mcp_tools()
     
     def _ensure_diagram_folder(self):
         """Create diagram folder if it doesn't exist"""
@@ -63,18 +206,15 @@ class DiagramGenerator:
             logger.info(f"Workspace directory: {self.workspace_dir}")
             logger.info(f"Diagram folder: {self.diagram_folder}")
             
-            # Setup MCP client with proper configuration
-            logger.info("Initializing MCP client for diagram generation")
-            mcp_client = MCPClient(lambda: stdio_client(
-                StdioServerParameters(
-                    command="uvx",
-                    args=["awslabs.aws-diagram-mcp-server"]
-                )
-            ))
+            # Build prompt with workspace directory
+            prompt = "\n" + architecture_design + self._prompt_tail
             
-            with mcp_client:
-                # Get available tools from MCP server
-                tools = mcp_client.list_tools_sync() + [image_reader, use_llm, load_tool]
+            # Generate diagram (serialized, since the MCP connection is shared). Tools are
+            # fetched after taking the lock so a connection reset by an earlier run, or found
+            # dead by the health check, is restarted rather than used closed.
+            with _generation_lock:
+                mcp_tools = _get_mcp_tools()
+                tools = mcp_tools + [image_reader, use_llm, load_tool]
                 logger.info(f"Available tools: {[tool.name if hasattr(tool, 'name') else str(tool) for tool in tools]}")
                 
                 # Create diagram agent
@@ -85,47 +225,45 @@ class DiagramGenerator:
                     load_tools_from_directory=False
                 )
                 
-                # Build prompt with workspace directory
-                prompt = f"""
-{architecture_design}
-
-{self.user_prompt}
-
-CRITICAL INSTRUCTIONS:
-- Save all diagrams to the workspace directory: {self.workspace_dir}
-- Use the workspace_dir parameter when calling diagram generation tools
-- Ensure diagrams are saved to: {self.diagram_folder}
-- Generate clear, professional architecture diagrams
-"""
-                
                 logger.info(f"Sending prompt to diagram agent (length: {len(prompt)} chars)")
                 
-                # Generate diagram
+                files_before = self._diagram_mtimes()
                 response = diagram_agent(prompt)
-                response_str = str(response)
-                
-                logger.info(f"Diagram agent response received (length: {len(response_str)} chars)")
-                logger.info(f"Response preview: {response_str[:200]}...")
                 
-                # Verify diagrams were created
-                diagram_files = self._list_diagram_files()
-                
-                if diagram_files:
-                    logger.info(f"Successfully generated {len(diagram_files)} diagram(s)")
+                # MCP tool failures come back as error tool results, not exceptions; restart
+                # the shared server after a run that hit one or produced no diagram files
+                if _mcp_tool_failed(diagram_agent.messages, {tool.tool_name for tool in mcp_tools}):
+                    logger.warning("Diagram MCP tool returned an error, resetting shared diagram server")
+                    _reset_mcp_client()
+                elif self._diagram_mtimes().items() <= files_before.items():
+                    logger.warning("Diagram run wrote no files, resetting shared diagram server")
+                    _reset_mcp_client()
+            # Stringify once; the same text feeds the log preview and the result dict
+            response_str = str(response)
+            logger.info(
+                "Diagram agent response received (length: %d chars), preview: %s...",
+                len(response_str), response_str[:200]
+            )
+            
+            # Verify diagrams were created
+            diagram_files = self._list_diagram_files()
+            
+            if diagram_files:
+                logger.info("Successfully generated %d diagram(s)", len(diagram_files))
+                if logger.isEnabledFor(logging.INFO):
                     for file_path in diagram_files:
-                        file_size = os.path.getsize(file_path)
-                        logger.info(f"  - {os.path.basename(file_path)} ({file_size:,} bytes)")
-                else:
-                    logger.warning("No diagram files found after generation")
-                
-                return {
-                    'status': 'success' if diagram_files else 'no_files',
-                    'diagram_paths': diagram_files,
-                    'response': response_str,
-                    'folder': self.diagram_folder,
-                    'error': None
-                }
-                
+                        logger.info("  - %s (%s bytes)", os.path.basename(file_path), f"{self._diagram_sizes.get(file_path, 0):,}")
+            else:
+                logger.warning("No diagram files found after generation")
+            
+            return {
+                'status': 'success' if diagram_files else 'no_files',
+                'diagram_paths': diagram_files,
+                'response': response_str,
+                'folder': self.diagram_folder,
+                'error': None
+            }
+            
         except Exception as e:
             error_msg = str(e)
             logger.error(f"Diagram generation failed: {error_msg}", exc_info=True)
@@ -138,6 +276,17 @@ CRITICAL INSTRUCTIONS:
                 'error': error_msg
             }
     
+    def _diagram_mtimes(self) -> Dict[str, int]:
+        """Map each diagram file to its modification time, to tell which files a run wrote"""
+        try:
+            with os.scandir(self.diagram_folder) as entries:
+                return {
+                    entry.path: entry.stat().st_mtime_ns
+                    for entry in entries if entry.name.endswith(DIAGRAM_EXTENSIONS)
+                }
+        except FileNotFoundError:
+            return {}
+    
     def _list_diagram_files(self) -> List[str]:
         """
         List all diagram files in the diagram folder
@@ -145,27 +294,49 @@ CRITICAL INSTRUCTIONS:
         Returns:
             List of full paths to diagram files
         """
-        if not os.path.exists(self.diagram_folder):
+        try:
+            folder_mtime = os.stat(self.diagram_folder).st_mtime_ns
+        except FileNotFoundError:
             logger.warning(f"Diagram folder does not exist: {self.diagram_folder}")
             return []
         
+        cached_mtime, cached_files = self._listing_cache
+        if cached_mtime == folder_mtime:
+            return list(cached_files)
+        
         files = []
+        sizes = {}
+        # Empty files may still be mid-write, so only cache a listing without them
+        cacheable = True
         try:
-            for filename in os.listdir(self.diagram_folder):
-                if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.svg')):
-                    full_path = os.path.join(self.diagram_folder, filename)
-                    
-                    # Only include files with non-zero size
-                    if os.path.exists(full_path) and os.path.getsize(full_path) > 0:
-                        files.append(full_path)
-                        logger.debug(f"Found diagram file: {filename} ({os.path.getsize(full_path)} bytes)")
-                    else:
-                        logger.warning(f"Skipping empty or missing file: {filename}")
+            # scandir reuses the directory walk, so each entry needs a single stat
+            with os.scandir(self.diagram_folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith(DIAGRAM_EXTENSIONS):
+                        try:
+                            file_size = entry.stat(follow_symlinks=False).st_size
+                        except FileNotFoundError:
+                            # Removed between the directory scan and the stat
+                            file_size = 0
+                        
+                        # Only include files with non-zero size
+                        if file_size > 0:
+                            files.append(entry.path)
+                            sizes[entry.path] = file_size
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug("Found diagram file: %s (%d bytes)", entry.name, file_size)
+                        else:
+                            cacheable = False
+                            logger.warning(f"Skipping empty or missing file: {entry.name}")
+            
+            if cacheable:
+                self._listing_cache = (folder_mtime, files)
         
         except Exception as e:
             logger.error(f"Error listing diagram files: {e}", exc_info=True)
         
-        return files
+        self._diagram_sizes = sizes
+        return list(files)
     
     def get_diagram_count(self) -> int:
         """
@@ -178,12 +349,18 @@ CRITICAL INSTRUCTIONS:
     
     def clear_diagrams(self):
         """Clear all diagrams from the diagram folder"""
+        count = 0
         try:
-            diagram_files = self._list_diagram_files()
-            for file_path in diagram_files:
-                os.remove(file_path)
-                logger.info(f"Removed diagram: {os.path.basename(file_path)}")
+            with os.scandir(self.diagram_folder) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and entry.name.endswith(DIAGRAM_EXTENSIONS):
+                        os.unlink(entry.path)
+                        count += 1
             
-            logger.info(f"Cleared {len(diagram_files)} diagram(s)")
+            logger.info(f"Cleared {count} diagram(s)")
+        except FileNotFoundError:
+            logger.warning(f"Diagram folder does not exist: {self.diagram_folder}")
         except Exception as e:
             logger.error(f"Error clearing diagrams: {e}", exc_info=True)
+        finally:
+            self._listing_cache = (None, None)
@@ -4,8 +4,10 @@ Simple launcher for SageMaker Migration Advisor
 Direct execution without complex threading
 """
 
+import os
 import sys
 import subprocess
+import importlib.util
 from pathlib import Path
 
 def main():
@@ -46,17 +48,8 @@ def main():
         sys.exit(1)
     
     # Check if streamlit is installed
-    try:
-        result = subprocess.run(
-            ["streamlit", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode != 0:
-            raise FileNotFoundError()
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        print("\n❌ Error: Streamlit is not installed or not in PATH")
+    if importlib.util.find_spec("streamlit") is None:
+        print("\n❌ Error: Streamlit is not installed")
         print("\nPlease install Streamlit:")
         print("  pip install streamlit")
         print("\nThen run this launcher again.")
@@ -67,18 +60,23 @@ def main():
     print(f"   A browser window will open shortly...")
     print("\n" + "="*60 + "\n")
     
+    command = [sys.executable, "-m", "streamlit", "run", str(script_path)]
+    
     try:
-        # Launch streamlit directly
-        subprocess.run(
-            ["streamlit", "run", str(script_path)],
-            cwd=str(script_path.parent)
-        )
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Interrupted by user")
-        sys.exit(130)
-    except Exception as e:
-        print(f"\n❌ Error launching {display_name}: {e}")
-        sys.exit(1)
+        # Replace the launcher process with streamlit so only one interpreter stays resident
+        os.chdir(str(script_path.parent))
+        sys.stdout.flush()
+        os.execv(sys.executable, command)
+    except OSError:
+        # exec unavailable - fall back to running streamlit as a child process
+        try:
+            subprocess.run(command, cwd=str(script_path.parent))
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Interrupted by user")
+            sys.exit(130)
+        except Exception as e:
+            print(f"\n❌ Error launching {display_name}: {e}")
+            sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -5,14 +5,21 @@ Supports both local development and ECS/Fargate deployments
 
 import os
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Directory containing this module, resolved once at import
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+
+@lru_cache(maxsize=1)
 def get_diagram_folder() -> str:
     """
     Get the appropriate diagram folder path based on the environment.
     
+    The result is cached, so the folder is resolved and created once per process.
+    
     Returns:
         str: Absolute path to the diagram folder
         
@@ -21,7 +28,7 @@ def get_diagram_folder() -> str:
     - Local: Use script_dir/generated-diagrams (persistent)
     """
     # Check if running in AWS environment (ECS/Fargate/Lambda)
-    is_aws_env = os.environ.get('AWS_EXECUTION_ENV') or os.environ.get('ECS_CONTAINER_METADATA_URI')
+    is_aws_env = is_aws_environment()
     
     if is_aws_env:
         # Running in AWS - use /tmp which is writable
@@ -29,8 +36,7 @@ def get_diagram_folder() -> str:
         logger.info(f"AWS environment detected - using /tmp for diagrams: {diagram_folder}")
     else:
         # Running locally - use script directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        diagram_folder = os.path.join(script_dir, 'generated-diagrams')
+        diagram_folder = os.path.join(_SCRIPT_DIR, 'generated-diagrams')
         logger.info(f"Local environment detected - using script directory: {diagram_folder}")
     
     # Ensure folder exists
@@ -48,6 +54,7 @@ def get_diagram_folder() -> str:
     return diagram_folder
 
 
+@lru_cache(maxsize=1)
 def get_workspace_dir() -> str:
     """
     Get the appropriate workspace directory for diagram generation.
@@ -60,18 +67,19 @@ def get_workspace_dir() -> str:
     - Local: Use script directory (persistent)
     """
     # Check if running in AWS environment
-    is_aws_env = os.environ.get('AWS_EXECUTION_ENV') or os.environ.get('ECS_CONTAINER_METADATA_URI')
+    is_aws_env = is_aws_environment()
     
     if is_aws_env:
         workspace_dir = '/tmp'
         logger.info(f"AWS environment detected - using /tmp as workspace: {workspace_dir}")
     else:
-        workspace_dir = os.path.dirname(os.path.abspath(__file__))
+        workspace_dir = _SCRIPT_DIR
         logger.info(f"Local environment detected - using script directory as workspace: {workspace_dir}")
     
     return workspace_dir
 
 
+@lru_cache(maxsize=1)
 def is_aws_environment() -> bool:
     """
     Check if running in AWS environment (ECS/Fargate/Lambda).
@@ -4,14 +4,432 @@ Generates comprehensive PDF migration reports with embedded diagrams
 """
 
 import os
-from typing import Dict, Any, Optional, List
-from io import BytesIO
+import re
+import datetime
+import html
+import tempfile
+from functools import lru_cache
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
+from typing import Dict, Any, Optional, List, BinaryIO, Union, Iterable, Iterator
 from logger_config import logger
 
+# Reports larger than this spill from memory to a temporary file while rendering
+PDF_SPOOL_MAX_SIZE = 4 * 1024 * 1024
+
+# Resolution diagrams are resampled to before embedding, in pixels per inch
+DIAGRAM_EMBED_DPI = 150
+
+# Quality used when opaque resampled diagrams are re-encoded as JPEG; reportlab embeds
+# JPEG data as-is instead of re-deflating the decoded pixels
+DIAGRAM_JPEG_QUALITY = 85
+
+# Extensions of diagram files embedded in the report
+_IMAGE_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.gif'})
+
+# Worker threads used to decode and resample diagrams in parallel
+DIAGRAM_PREP_WORKERS = 4
+
+# Most diagrams embedded in one report, to avoid PDF bloat
+DIAGRAM_LIMIT = 4
+
+# Import reportlab components once at module load; generate_report checks
+# _IMPORT_ERROR up front and returns None if they are unavailable
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import (
+        SimpleDocTemplate, Paragraph, Spacer, PageBreak,
+        Table, TableStyle, Image as RLImage
+    )
+    from PIL import Image
+    _IMPORT_ERROR = None
+except ImportError as e:
+    _IMPORT_ERROR = e
+
+# Characters stripped from report text in a single str.translate pass (they render as ■ in PDFs):
+# emojis (U+1F300-U+1F9FF, U+1FA70-U+1FAFF), regional indicators (U+1F1E0-U+1F1FF),
+# misc symbols (U+2600-U+26FF) including ✅ ❌, dingbats (U+2700-U+27BF), variation
+# selectors (U+FE00-U+FE0F), box drawing (U+2500-U+257F), geometric shapes (U+25A0-U+25FF)
+# and arrows (U+2190-U+21FF)
+_STRIP_TABLE = dict.fromkeys(chain(
+    range(0x1F300, 0x1FA00), range(0x1FA70, 0x1FB00), range(0x1F1E0, 0x1F200),
+    range(0x2600, 0x2700), range(0x2700, 0x27C0), range(0xFE00, 0xFE10),
+    range(0x2500, 0x2580), range(0x25A0, 0x2600), range(0x2190, 0x2200)
+))
+
+# Table cell characters removed before and after space collapsing, respectively
+_CELL_BOX_TABLE = str.maketrans('', '', '─│┌┐└┘├┤┬┴┼═║╔╗╚╝╠╣╦╩╬■□▪▫●○◆◇★☆✓✗✘')
+_CELL_MARKER_TABLE = str.maketrans('', '', '#🟡❌✅')
+
+# Markdown cleanup patterns, compiled once and shared by every report
+_SEPARATOR_LINE_RE = re.compile(r'^[-=]{3,}$', re.MULTILINE)
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+_BRACKET_LINE_RE = re.compile(r'\[([^\]]+)\]\s*\n')
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+_BLANK_LINE_RE = re.compile(r'^\s+$', re.MULTILINE)
+_TRAILING_SPACES_RE = re.compile(r' +$', re.MULTILINE)
+_HASH_LINE_RE = re.compile(r'^[^\n]*#[^\n]*$', re.MULTILINE)
+_LINE_END_WS_RE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+# A run of wrapped prose: a line that is not a header, bullet or table row and doesn't
+# end a sentence, then continuation lines that don't start with a marker, stopping
+# after a line that ends with terminal punctuation (a trailing comma only stops the first line)
+_CONTINUATION_RUN_RE = re.compile(
+    r'^(?!#)(?![^\S\n]*(?:•|- |\* ))[^\n|]*[^\s|](?<![.!?)":,])(?<!\*\*)'
+    r'\n[^\S\n]*(?=[^\s#•\-*|])[^\n]*'
+    r'(?:(?<![.!?)":])(?<!\*\*)\n[^\S\n]*(?=[^\s#•\-*|])[^\n]*)*',
+    re.MULTILINE
+)
+_WRAPPED_BREAK_RE = re.compile(r'\n[^\S\n]*')
+# Inline markdown patterns applied to every parsed line and table cell
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+_INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+_BULLET_PREFIX_RE = re.compile(r'^[•\-\*]\s*')
+# Line prefixes that mark a bullet point
+_BULLET_PREFIXES = ('•', '- ', '* ')
+# Anything cleanup could change beyond trimming the ends: line breaks (wrapped-line joining),
+# # markers, stripped symbol ranges, comments, double spaces and separator runs
+_DIRTY_RE = re.compile(
+    r'[\n#\u2190-\u21FF\u2500-\u27BF\uFE00-\uFE0F\U0001F1E0-\U0001F1FF\U0001F300-\U0001FAFF]'
+    r'|<!--|  |[-=]{3}'
+)
+
+
+# Non-breaking space runs used to indent code block lines, indexed by indent width
+_NBSP_CACHE = ['&nbsp;' * i for i in range(81)]
+
+# Report palette, parsed once rather than per table or style
+if _IMPORT_ERROR is None:
+    _PRIMARY_COLOR = colors.HexColor('#2E86AB')
+    _ACCENT_COLOR = colors.HexColor('#FF6B35')
+    _LIGHT_BG_COLOR = colors.HexColor('#F8F9FA')
+    _BORDER_COLOR = colors.HexColor('#DEE2E6')
+    _CODE_BG_COLOR = colors.HexColor('#F5F5F5')
+    _CODE_BORDER_COLOR = colors.HexColor('#CCCCCC')
+    _TOTAL_ROW_COLOR = colors.HexColor('#F0F0F0')
+
+# Markdown table cell styles (with text wrapping) and column widths by column count
+if _IMPORT_ERROR is None:
+    _TABLE_CELL_STYLE = ParagraphStyle(
+        'TableCell',
+        fontSize=9,
+        leading=11,
+        wordWrap='CJK',
+        alignment=0  # Left align
+    )
+    
+    _TABLE_CELL_RIGHT_STYLE = ParagraphStyle(
+        'TableCellRight',
+        fontSize=9,
+        leading=11,
+        wordWrap='CJK',
+        alignment=2  # Right align
+    )
+    
+    _TABLE_HEADER_STYLE = ParagraphStyle(
+        'TableHeader',
+        fontSize=10,
+        leading=12,
+        wordWrap='CJK',
+        alignment=1,  # Center align
+        textColor=colors.whitesmoke
+    )
+    
+    _TABLE_COL_WIDTHS = {
+        5: (1.6*inch, 1.4*inch, 1.4*inch, 1.3*inch, 1.3*inch),
+        4: (2.2*inch, 1.6*inch, 1.6*inch, 1.6*inch),
+        3: (2.5*inch, 2*inch, 2*inch),
+        2: (3*inch, 3.5*inch),
+    }
+    
+    # Markdown table commands shared by every table; row highlights are appended per table
+    _BASE_TABLE_STYLE = (
+        # Header row styling (always row 0 now after reordering)
+        ('BACKGROUND', (0, 0), (-1, 0), _PRIMARY_COLOR),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        
+        # Data rows styling, alternating row colors for better readability
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _LIGHT_BG_COLOR]),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        
+        # Grid and borders
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('LINEBELOW', (0, 0), (-1, 0), 2, _PRIMARY_COLOR),
+        
+        # Padding - increased for better spacing
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+    )
+
+# Title page summary table style, built once and shared by every report
+_TITLE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), _LIGHT_BG_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, _BORDER_COLOR),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+]) if _IMPORT_ERROR is None else None
+# Title table row height in points: 10pt text on 12pt leading plus 6pt top and bottom padding
+_TITLE_ROW_HEIGHT = 24
+
+# Agent response keys that feed report sections
+_AGENT_KEYS = ('description', 'qa', 'sagemaker', 'tco', 'navigator')
+
+# Report sections after the title page, in order: (log label, builder method name)
+_REPORT_SECTIONS = (
+    ('table of contents', '_add_table_of_contents'),
+    ('executive summary', '_add_executive_summary'),
+    ('architecture analysis', '_add_architecture_analysis'),
+    ('Q&A section', '_add_qa_section'),
+    ('SageMaker design', '_add_sagemaker_design'),
+    ('diagrams', '_add_diagrams'),
+    ('TCO analysis', '_add_tco_analysis'),
+    ('migration roadmap', '_add_migration_roadmap'),
+    ('implementation recommendations', '_add_implementation_recommendations'),
+)
+
+# Table of contents entries, in report order
+_TOC_ENTRIES = (
+    "1. Executive Summary",
+    "2. Current Architecture Analysis",
+    "3. Clarification Questions & Answers",
+    "4. Proposed SageMaker Architecture",
+    "   4.1 Architecture Design",
+    "   4.2 Architecture Diagrams",
+    "5. Total Cost of Ownership Analysis",
+    "6. Migration Roadmap",
+    "7. Implementation Recommendations",
+    "8. Appendices",
+)
+
+# Executive summary markup; only the completed phase count varies per report
+_EXEC_SUMMARY_TMPL = """
+This comprehensive migration advisory report provides a detailed analysis and roadmap for migrating your current 
+ML/GenAI architecture to Amazon SageMaker. The assessment includes {completed_steps} completed analysis phases, 
+covering current state architecture, clarification requirements, proposed SageMaker design, cost analysis, 
+and a detailed implementation roadmap.
+<br/><br/>
+<b>Key Findings:</b><br/>
+• Current architecture has been thoroughly analyzed and documented<br/>
+• Migration requirements and constraints have been clarified through interactive Q&A<br/>
+• A modern SageMaker-based architecture has been designed to address current limitations<br/>
+• Total cost of ownership analysis shows projected benefits and investment requirements<br/>
+• A step-by-step migration roadmap provides clear implementation guidance<br/><br/>
+
+<b>Recommendation:</b><br/>
+Proceed with the proposed SageMaker migration following the detailed roadmap provided in this report. 
+The migration will improve scalability, reduce operational overhead, and provide better ML lifecycle management.
+"""
+
+# Static closing section of every report, kept as Paragraph mini-HTML
+_RECOMMENDATIONS_HTML = """
+<b>7.1 Pre-Migration Checklist</b><br/>
+• Ensure all team members have appropriate AWS training<br/>
+• Set up development and testing environments<br/>
+• Establish backup and rollback procedures<br/>
+• Create detailed project timeline with milestones<br/>
+• Identify and mitigate potential risks<br/><br/>
+
+<b>7.2 Success Criteria</b><br/>
+• All ML models successfully migrated to SageMaker<br/>
+• Performance metrics meet or exceed current benchmarks<br/>
+• Cost targets achieved as outlined in TCO analysis<br/>
+• Team productivity maintained or improved<br/>
+• Security and compliance requirements satisfied<br/><br/>
+
+<b>7.3 Post-Migration Activities</b><br/>
+• Monitor system performance and costs<br/>
+• Optimize resource utilization<br/>
+• Implement advanced SageMaker features<br/>
+• Conduct team training on new workflows<br/>
+• Document lessons learned and best practices<br/><br/>
+
+<b>7.4 Support and Resources</b><br/>
+• AWS Support: Consider upgrading to Business or Enterprise support<br/>
+• AWS Professional Services: Engage for complex migration scenarios<br/>
+• AWS Training: Enroll team in SageMaker certification programs<br/>
+• Community: Join AWS ML community forums and user groups
+"""
+
+
+def _strip_non_heading_hashes(line: str) -> str:
+    """Keep # markers on heading lines (# followed by space or #) and drop them elsewhere"""
+    stripped = line.strip()
+    if stripped.startswith('#') and len(stripped) > 1 and (stripped[1] == ' ' or stripped[1] == '#'):
+        return line
+    return line.replace('#', '')
+
+
+# Heading level -> (marker removed from the text, style, space before, space after in inches)
+_HEADING_LAYOUT = {
+    1: ('#', 'heading', 0.2, 0.15),
+    2: ('##', 'heading', 0.2, 0.15),
+    3: ('###', 'subheading', 0.15, 0.1),
+}
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of text lazily, exactly as text.split('\\n') would return them"""
+    for line in StringIO(text):
+        yield line[:-1] if line.endswith('\n') else line
+    # split() also yields a final empty line after a trailing newline (or for empty text)
+    if not text or text.endswith('\n'):
+        yield ''
+
+
+def _tokenize_markdown_blocks(lines: Iterable[str], code_blocks: bool = True, tables: bool = True):
+    """
+    Split markdown lines into block tokens in a single forward pass
+    
+    Lines are consumed lazily with one line of lookahead, so only the block
+    being assembled (a table or code block) is held in memory.
+    
+    Args:
+        lines: Markdown content as an iterable of lines
+        code_blocks: Treat ``` fences as code blocks rather than plain text
+        tables: Whether the content may contain tables; False skips the per-line | check
+        
+    Yields:
+        (kind, payload) tuples: ('blank', None), ('code', code lines), ('table', raw table lines),
+        or ('heading' | 'bold' | 'bullet' | 'para', stripped line)
+    """
+    lines = iter(lines)
+    # Line read past the end of a table candidate, classified next
+    pending = None
+    while True:
+        if pending is not None:
+            raw, pending = pending, None
+        else:
+            raw = next(lines, None)
+            if raw is None:
+                return
+        line = raw.strip()
+        
+        if not line:
+            yield 'blank', None
+            continue
+        
+        if code_blocks and line.startswith('```'):
+            code_lines = []
+            # Runs to the closing ``` (consumed) or the end of the content
+            for code_line in lines:
+                if code_line.strip().startswith('```'):
+                    break
+                code_lines.append(code_line)
+            yield 'code', code_lines
+            continue
+        
+        # Tables come before headings, as tables can contain #; a table
+        # needs at least two consecutive lines with |
+        if tables and '|' in line:
+            table_lines = [raw]
+            for next_line in lines:
+                if '|' not in next_line:
+                    pending = next_line
+                    break
+                table_lines.append(next_line)
+            if len(table_lines) > 1:
+                yield 'table', table_lines
+                continue
+        
+        if line[0] == '#':
+            kind = 'heading'
+        elif line.startswith('**') and line.endswith('**'):
+            kind = 'bold'
+        elif line.startswith(_BULLET_PREFIXES):
+            kind = 'bullet'
+        else:
+            kind = 'para'
+        yield kind, line
+
+
+@lru_cache(maxsize=256)
+def _clean_markdown(text: str) -> str:
+    """Clean markdown artifacts and normalize text for PDF generation (memoized, pure)"""
+    # Fast path: single-line text with nothing for the passes below to rewrite
+    if not _DIRTY_RE.search(text):
+        return text.strip()
+    
+    # DON'T remove code block markers - we'll handle them in parsing
+    # Code blocks will be detected and formatted specially
+    
+    # Remove emojis, box drawing characters, bullets and special symbols - these render as ■ in PDFs
+    text = text.translate(_STRIP_TABLE)
+    
+    # DO NOT remove markdown table separator lines here!
+    # The _add_formatted_table method needs them to identify headers correctly
+    
+    # Remove lines that are just dashes or equals (markdown separators)
+    # But NOT table separators (which contain |)
+    text = _SEPARATOR_LINE_RE.sub('', text)
+    
+    # Remove HTML-style comments
+    text = _HTML_COMMENT_RE.sub('', text)
+    
+    # Remove bracket notation like [Data Scientists] that are part of diagrams
+    text = _BRACKET_LINE_RE.sub(r'\1\n', text)
+    
+    # Keep # for headings but remove from other places
+    text = _HASH_LINE_RE.sub(lambda m: _strip_non_heading_hashes(m.group(0)), text)
+    text = _LINE_END_WS_RE.sub('', text)
+    
+    # Fix hard line breaks within paragraphs: join each run of wrapped prose lines
+    # (not headers, bullets or tables) into one line
+    text = _CONTINUATION_RUN_RE.sub(lambda m: _WRAPPED_BREAK_RE.sub(' ', m.group(0)), text)
+    
+    # Clean up multiple spaces
+    text = _MULTI_SPACE_RE.sub(' ', text)
+    
+    # Remove empty lines with only whitespace
+    text = _BLANK_LINE_RE.sub('', text)
+    
+    # Remove trailing spaces
+    text = _TRAILING_SPACES_RE.sub('', text)
+    
+    # Final pass: ensure no more than 2 consecutive newlines
+    text = _EXCESS_NEWLINES_RE.sub('\n\n', text)
+    
+    return text.strip()
+
+
+@lru_cache(maxsize=1024)
+def _clean_table_cell(cell: str) -> str:
+    """Strip markdown artifacts and special characters from a table cell (memoized, pure)"""
+    # Remove box drawing characters
+    cell = cell.translate(_CELL_BOX_TABLE)
+    # Remove excessive spaces (most cells have none, so skip the regex then)
+    if '  ' in cell:
+        cell = _MULTI_SPACE_RE.sub(' ', cell)
+    # Remove markdown bold markers but keep the text
+    if '**' in cell:
+        cell = _BOLD_RE.sub(r'\1', cell)
+    # Remove # and emoji symbols from table cells
+    cell = cell.translate(_CELL_MARKER_TABLE)
+    return cell.strip()
+
 
 class PDFReportGenerator:
     """Generates comprehensive PDF migration reports"""
     
+    # Paragraph styles shared by every report, built on first use
+    _STYLES: Optional[Dict] = None
+    
     def __init__(self, workflow_state: Dict[str, Any], diagram_folder: str, model_name: str = "Claude AI"):
         """
         Initialize PDFReportGenerator
@@ -24,96 +442,99 @@ class PDFReportGenerator:
         self.workflow_state = workflow_state
         self.diagram_folder = diagram_folder
         self.model_name = model_name
+        # Agent outputs and Q&A exchanges, looked up once for every section
+        self._agents = workflow_state.get('agent_responses') or {}
+        self._qa_convo = (workflow_state.get('qa_session') or {}).get('conversation') or []
+        # Raw diagram bytes keyed by path, read once and shared by every embed
+        self._image_cache: Dict[str, bytes] = {}
+        # Downscaled diagram bytes keyed by (path, width, height) in pixels
+        self._resized_image_cache: Dict[tuple, bytes] = {}
     
-    def generate_report(self) -> Optional[bytes]:
+    def generate_report(self, output: Optional[BinaryIO] = None) -> Optional[Union[bytes, BinaryIO]]:
         """
         Generate complete PDF report
         
+        Args:
+            output: Optional writable binary stream to render the PDF into. When
+                generating many reports, pass a caller-owned temp file and reuse it
+                to avoid holding each document in memory.
+        
         Returns:
-            PDF bytes if successful, None if failed
+            PDF bytes (or the given output stream) if successful, None if failed
         """
+        if _IMPORT_ERROR is not None:
+            logger.error(f"Missing reportlab dependency: {_IMPORT_ERROR}")
+            return None
+        
         try:
-            # Import reportlab components
-            from reportlab.lib.pagesizes import A4
-            from reportlab.platypus import (
-                SimpleDocTemplate, Paragraph, Spacer, PageBreak,
-                Table, TableStyle
-            )
-            from reportlab.lib.styles import getSampleStyleSheet
-            from reportlab.lib.units import inch
-            import datetime
-            
             logger.info("Starting PDF report generation")
             
-            # Create PDF buffer
-            buffer = BytesIO()
-            doc = SimpleDocTemplate(
-                buffer,
-                pagesize=A4,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=18
-            )
-            
-            # Get and customize styles
-            styles = self._create_styles(getSampleStyleSheet())
-            story = []
-            
-            # Build report sections
-            logger.info("Adding title page")
-            self._add_title_page(story, styles)
-            
-            logger.info("Adding table of contents")
-            self._add_table_of_contents(story, styles)
-            
-            logger.info("Adding executive summary")
-            self._add_executive_summary(story, styles)
-            
-            logger.info("Adding architecture analysis")
-            self._add_architecture_analysis(story, styles)
-            
-            logger.info("Adding Q&A section")
-            self._add_qa_section(story, styles)
-            
-            logger.info("Adding SageMaker design")
-            self._add_sagemaker_design(story, styles)
+            if output is not None:
+                self._build_document(output)
+                logger.info("PDF generated successfully into caller-supplied stream")
+                return output
             
-            logger.info("Adding diagrams")
-            self._add_diagrams(story, styles)
-            
-            logger.info("Adding TCO analysis")
-            self._add_tco_analysis(story, styles)
-            
-            logger.info("Adding migration roadmap")
-            self._add_migration_roadmap(story, styles)
-            
-            logger.info("Adding implementation recommendations")
-            self._add_implementation_recommendations(story, styles)
-            
-            # Build PDF
-            logger.info("Building PDF document")
-            doc.build(story)
-            buffer.seek(0)
-            
-            pdf_bytes = buffer.getvalue()
-            logger.info(f"PDF generated successfully ({len(pdf_bytes):,} bytes)")
+            # Render into a temp file that spills to disk once large; it is closed
+            # on failure too, so only the returned bytes outlive this call
+            with tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE) as buffer:
+                self._build_document(buffer)
+                buffer.seek(0)
+                pdf_bytes = buffer.read()
+            logger.info("PDF generated successfully (%d bytes)", len(pdf_bytes))
             
             return pdf_bytes
             
-        except ImportError as e:
-            logger.error(f"Missing reportlab dependency: {e}")
-            return None
         except Exception as e:
             logger.error(f"PDF generation failed: {e}", exc_info=True)
             return None
+        finally:
+            # Diagram bytes are embedded in the document by now
+            self._image_cache.clear()
+            self._resized_image_cache.clear()
     
-    def _create_styles(self, base_styles) -> Dict:
-        """Create custom PDF styles"""
-        from reportlab.lib import colors
-        from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
-        from reportlab.lib.styles import ParagraphStyle
+    def _build_document(self, stream: BinaryIO):
+        """Lay out the report and write the PDF into stream"""
+        doc = SimpleDocTemplate(
+            stream,
+            pagesize=A4,
+            rightMargin=72,
+            leftMargin=72,
+            topMargin=72,
+            bottomMargin=18
+        )
         
+        # Get and customize styles
+        styles = self._get_styles()
+        story = []
+        
+        # Build report sections
+        logger.debug("Adding title page")
+        self._add_title_page(story, styles)
+        
+        if any(self._agents.get(key) for key in _AGENT_KEYS) or self._qa_convo:
+            for label, method_name in _REPORT_SECTIONS:
+                logger.debug("Adding %s", label)
+                getattr(self, method_name)(story, styles)
+        else:
+            # Nothing to analyse; skip the section pipeline and its placeholder pages
+            logger.warning("No agent output available, generating title page only")
+            story.append(Paragraph("No analysis data available.", styles['body']))
+        
+        # Build PDF; reportlab consumes the story as it lays out pages, so
+        # flowables are released section by section rather than at the end
+        logger.info("Building PDF document")
+        doc.build(story)
+    
+    @classmethod
+    def _get_styles(cls) -> Dict:
+        """Return the shared PDF styles, creating them on first use"""
+        if cls._STYLES is None:
+            cls._STYLES = cls._create_styles(getSampleStyleSheet())
+        return cls._STYLES
+    
+    @staticmethod
+    def _create_styles(base_styles) -> Dict:
+        """Create custom PDF styles"""
         return {
             'title': ParagraphStyle(
                 'CustomTitle',
@@ -121,7 +542,7 @@ class PDFReportGenerator:
                 fontSize=24,
                 spaceAfter=30,
                 alignment=TA_CENTER,
-                textColor=colors.HexColor('#2E86AB')
+                textColor=_PRIMARY_COLOR
             ),
             'heading': ParagraphStyle(
                 'CustomHeading',
@@ -129,7 +550,7 @@ class PDFReportGenerator:
                 fontSize=16,
                 spaceAfter=12,
                 spaceBefore=20,
-                textColor=colors.HexColor('#FF6B35')
+                textColor=_ACCENT_COLOR
             ),
             'subheading': ParagraphStyle(
                 'CustomSubHeading',
@@ -137,7 +558,7 @@ class PDFReportGenerator:
                 fontSize=14,
                 spaceAfter=8,
                 spaceBefore=12,
-                textColor=colors.HexColor('#2E86AB')
+                textColor=_PRIMARY_COLOR
             ),
             'body': ParagraphStyle(
                 'CustomBody',
@@ -150,11 +571,6 @@ class PDFReportGenerator:
     
     def _add_title_page(self, story: List, styles: Dict):
         """Add title page to PDF"""
-        from reportlab.platypus import Paragraph, Spacer, PageBreak, Table, TableStyle
-        from reportlab.lib.units import inch
-        from reportlab.lib import colors
-        import datetime
-        
         story.append(Paragraph("SageMaker Migration Advisory Report", styles['title']))
         story.append(Spacer(1, 0.5*inch))
         
@@ -166,84 +582,38 @@ class PDFReportGenerator:
             ['Report Status', 'Ready for Implementation']
         ]
         
-        exec_table = Table(exec_data, colWidths=[2*inch, 3*inch])
-        exec_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F8F9FA')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#DEE2E6')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
+        # Rows are single-line text, so pass their fixed height rather than have reportlab measure every cell
+        exec_table = Table(exec_data, colWidths=[2*inch, 3*inch], rowHeights=[_TITLE_ROW_HEIGHT] * len(exec_data))
+        exec_table.setStyle(_TITLE_TABLE_STYLE)
         
         story.append(exec_table)
         story.append(PageBreak())
     
     def _add_table_of_contents(self, story: List, styles: Dict):
         """Add table of contents"""
-        from reportlab.platypus import Paragraph, Spacer, PageBreak
-        
         story.append(Paragraph("Table of Contents", styles['heading']))
-        toc_data = [
-            "1. Executive Summary",
-            "2. Current Architecture Analysis",
-            "3. Clarification Questions & Answers",
-            "4. Proposed SageMaker Architecture",
-            "   4.1 Architecture Design",
-            "   4.2 Architecture Diagrams",
-            "5. Total Cost of Ownership Analysis",
-            "6. Migration Roadmap",
-            "7. Implementation Recommendations",
-            "8. Appendices"
-        ]
         
-        for item in toc_data:
+        for item in _TOC_ENTRIES:
             story.append(Paragraph(item, styles['body']))
         
         story.append(PageBreak())
     
     def _add_executive_summary(self, story: List, styles: Dict):
         """Add executive summary section"""
-        from reportlab.platypus import Paragraph, Spacer, PageBreak
-        
         story.append(Paragraph("1. Executive Summary", styles['heading']))
         
         completed_steps = len(self.workflow_state.get('completed_steps', []))
         
-        summary_text = f"""
-        This comprehensive migration advisory report provides a detailed analysis and roadmap for migrating your current 
-        ML/GenAI architecture to Amazon SageMaker. The assessment includes {completed_steps} completed analysis phases, 
-        covering current state architecture, clarification requirements, proposed SageMaker design, cost analysis, 
-        and a detailed implementation roadmap.
-        <br/><br/>
-        <b>Key Findings:</b><br/>
-        • Current architecture has been thoroughly analyzed and documented<br/>
-        • Migration requirements and constraints have been clarified through interactive Q&A<br/>
-        • A modern SageMaker-based architecture has been designed to address current limitations<br/>
-        • Total cost of ownership analysis shows projected benefits and investment requirements<br/>
-        • A step-by-step migration roadmap provides clear implementation guidance<br/><br/>
-        
-        <b>Recommendation:</b><br/>
-        Proceed with the proposed SageMaker migration following the detailed roadmap provided in this report. 
-        The migration will improve scalability, reduce operational overhead, and provide better ML lifecycle management.
-        """
+        summary_text = _EXEC_SUMMARY_TMPL.format(completed_steps=completed_steps)
         
         story.append(Paragraph(summary_text, styles['body']))
         story.append(PageBreak())
     
     def _add_architecture_analysis(self, story: List, styles: Dict):
         """Add current architecture analysis section with proper markdown cleaning"""
-        from reportlab.platypus import Paragraph, Spacer, PageBreak
-        
         story.append(Paragraph("2. Current Architecture Analysis", styles['heading']))
         
-        arch_response = self.workflow_state['agent_responses'].get('description', {})
+        arch_response = self._agents.get('description', {})
         if arch_response:
             story.append(Paragraph("2.1 Architecture Overview", styles['subheading']))
             
@@ -261,31 +631,26 @@ class PDFReportGenerator:
     
     def _add_qa_section(self, story: List, styles: Dict):
         """Add Q&A section to PDF with proper markdown cleaning"""
-        from reportlab.platypus import Paragraph, Spacer, PageBreak
-        from reportlab.lib.units import inch
-        
         story.append(Paragraph("3. Clarification Questions & Answers", styles['heading']))
         
-        qa_session = self.workflow_state.get('qa_session', {})
-        qa_response = self.workflow_state['agent_responses'].get('qa', {})
+        qa_response = self._agents.get('qa', {})
         
-        if qa_session and qa_session.get('conversation', []):
+        if self._qa_convo:
             story.append(Paragraph("3.1 Interactive Q&A Session", styles['subheading']))
             
-            for i, exchange in enumerate(qa_session['conversation']):
-                story.append(Paragraph(f"<b>Question {i+1}:</b>", styles['subheading']))
-                question_text = exchange.get('question', '')
-                question_text = self._clean_markdown_for_pdf(question_text)
+            subheading_style = styles['subheading']
+            for i, exchange in enumerate(self._qa_convo, 1):
+                story.append(Paragraph(f"<b>Question {i}:</b>", subheading_style))
+                question_text = self._clean_markdown_for_pdf(exchange.get('question', ''))
                 self._parse_and_format_content(question_text, story, styles)
                 
-                story.append(Paragraph(f"<b>Answer {i+1}:</b>", styles['subheading']))
-                answer_text = exchange.get('answer', 'No answer provided')
-                answer_text = self._clean_markdown_for_pdf(answer_text)
+                story.append(Paragraph(f"<b>Answer {i}:</b>", subheading_style))
+                answer_text = self._clean_markdown_for_pdf(exchange.get('answer', 'No answer provided'))
                 self._parse_and_format_content(answer_text, story, styles)
                 
-                if exchange.get('synthesis'):
-                    story.append(Paragraph(f"<b>AI Understanding:</b>", styles['subheading']))
-                    synthesis_text = exchange.get('synthesis', '')
+                synthesis_text = exchange.get('synthesis')
+                if synthesis_text:
+                    story.append(Paragraph("<b>AI Understanding:</b>", subheading_style))
                     synthesis_text = self._clean_markdown_for_pdf(synthesis_text)
                     story.append(Paragraph(f"✓ {synthesis_text}", styles['body']))
                 
@@ -301,11 +666,9 @@ class PDFReportGenerator:
     
     def _add_sagemaker_design(self, story: List, styles: Dict):
         """Add SageMaker design section with proper markdown cleaning"""
-        from reportlab.platypus import Paragraph, Spacer, PageBreak
-        
         story.append(Paragraph("4. Proposed SageMaker Architecture", styles['heading']))
         
-        sagemaker_response = self.workflow_state['agent_responses'].get('sagemaker', {})
+        sagemaker_response = self._agents.get('sagemaker', {})
         if sagemaker_response:
             story.append(Paragraph("4.1 Architecture Design", styles['subheading']))
             
@@ -323,14 +686,18 @@ class PDFReportGenerator:
     
     def _add_diagrams(self, story: List, styles: Dict):
         """Add architecture diagrams with robust error handling"""
-        from reportlab.platypus import Paragraph, Spacer, Image as RLImage
-        from reportlab.lib.units import inch
-        from PIL import Image
-        
         story.append(Paragraph("4.2 Architecture Diagrams", styles['subheading']))
         
-        # Check if diagram folder exists
-        if not os.path.exists(self.diagram_folder):
+        # Get diagram entries; scandir carries file type and stat info from the directory read
+        try:
+            with os.scandir(self.diagram_folder) as it:
+                diagram_files = [
+                    e for e in it
+                    if e.is_file() and os.path.splitext(e.name)[1].lower() in _IMAGE_EXTS
+                ]
+            # Directory order is filesystem dependent; sort so reports are reproducible
+            diagram_files.sort(key=lambda e: e.name)
+        except FileNotFoundError:
             logger.warning(f"Diagram folder not found: {self.diagram_folder}")
             story.append(Paragraph(
                 "No diagrams folder found. Diagrams may not have been generated.",
@@ -338,12 +705,6 @@ class PDFReportGenerator:
             ))
             return
         
-        # Get list of diagram files
-        diagram_files = [
-            f for f in os.listdir(self.diagram_folder)
-            if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif'))
-        ]
-        
         if not diagram_files:
             logger.info("No diagram files found in folder")
             story.append(Paragraph(
@@ -352,84 +713,45 @@ class PDFReportGenerator:
             ))
             return
         
-        logger.info(f"Found {len(diagram_files)} diagram file(s) to embed")
+        logger.info("Found %d diagram file(s) to embed", len(diagram_files))
         
-        # Limit to 4 diagrams to avoid PDF bloat
-        for idx, diagram_file in enumerate(diagram_files[:4], 1):
+        # Limit the number of diagrams; decode and resample them concurrently
+        selected_files = diagram_files[:DIAGRAM_LIMIT]
+        extra_count = len(diagram_files) - len(selected_files)
+        with ThreadPoolExecutor(max_workers=min(DIAGRAM_PREP_WORKERS, len(selected_files))) as executor:
+            prepared = list(executor.map(
+                self._prepare_diagram, range(1, len(selected_files) + 1), selected_files
+            ))
+        
+        # Assemble the story in file order regardless of which worker finished first;
+        # embedded files are logged once after the loop rather than per diagram
+        embedded = []
+        for idx, (entry, diagram) in enumerate(zip(selected_files, prepared), 1):
+            diagram_file = entry.name
+            if diagram['status'] == 'skipped':
+                continue
+            
+            if diagram['status'] == 'invalid':
+                story.append(Paragraph(
+                    f"<i>Note: Could not process {diagram_file} - invalid image format</i>",
+                    styles['body']
+                ))
+                continue
+            
             try:
-                img_path = os.path.join(self.diagram_folder, diagram_file)
-                
-                # Verify file exists and has content
-                if not os.path.exists(img_path):
-                    logger.warning(f"Diagram file not found: {diagram_file}")
-                    continue
-                
-                file_size = os.path.getsize(img_path)
-                if file_size == 0:
-                    logger.warning(f"Skipping empty file: {diagram_file}")
-                    continue
-                
-                logger.info(f"Embedding diagram {idx}: {diagram_file} ({file_size:,} bytes)")
-                
-                # Open with PIL to get dimensions and verify it's a valid image
-                try:
-                    pil_img = Image.open(img_path)
-                    img_width, img_height = pil_img.size
-                    logger.debug(f"Image dimensions: {img_width}x{img_height}")
-                except Exception as e:
-                    logger.error(f"Failed to open image with PIL: {e}")
-                    story.append(Paragraph(
-                        f"<i>Note: Could not process {diagram_file} - invalid image format</i>",
-                        styles['body']
-                    ))
-                    continue
-                
-                # Calculate dimensions to fit on page (max 6 inches wide, 4 inches high)
-                max_width = 6 * inch
-                max_height = 4 * inch
-                
-                # Calculate aspect ratio
-                aspect_ratio = img_width / img_height
-                
-                # Determine display dimensions while maintaining aspect ratio
-                if img_width > img_height:
-                    # Landscape orientation
-                    display_width = min(max_width, img_width)
-                    display_height = display_width / aspect_ratio
-                    
-                    # Ensure height doesn't exceed max
-                    if display_height > max_height:
-                        display_height = max_height
-                        display_width = display_height * aspect_ratio
-                else:
-                    # Portrait orientation
-                    display_height = min(max_height, img_height)
-                    display_width = display_height * aspect_ratio
-                    
-                    # Ensure width doesn't exceed max
-                    if display_width > max_width:
-                        display_width = max_width
-                        display_height = display_width / aspect_ratio
+                if diagram['status'] == 'error':
+                    raise diagram['error']
                 
-                logger.debug(f"Display dimensions: {display_width/inch:.2f}x{display_height/inch:.2f} inches")
-                
-                # Verify aspect ratio is preserved (within 1% tolerance)
-                original_ratio = img_width / img_height
-                display_ratio = display_width / display_height
-                ratio_diff = abs(original_ratio - display_ratio) / original_ratio
-                
-                if ratio_diff > 0.01:
-                    logger.warning(f"Aspect ratio deviation: {ratio_diff*100:.2f}%")
+                diagram_title = diagram['title']
                 
                 # Add diagram title
-                diagram_title = diagram_file.replace('_', ' ').replace('.png', '').replace('.jpg', '').replace('.jpeg', '').title()
                 story.append(Paragraph(
                     f"<b>Diagram {idx}: {diagram_title}</b>",
                     styles['subheading']
                 ))
                 
                 # Add the image
-                rl_img = RLImage(img_path, width=display_width, height=display_height)
+                rl_img = RLImage(BytesIO(diagram['data']), width=diagram['width'], height=diagram['height'])
                 story.append(rl_img)
                 story.append(Spacer(1, 0.2 * inch))
                 
@@ -440,7 +762,7 @@ class PDFReportGenerator:
                 ))
                 story.append(Spacer(1, 0.3 * inch))
                 
-                logger.info(f"Successfully embedded diagram {idx}")
+                embedded.append(diagram_file)
                 
             except Exception as e:
                 logger.error(f"Failed to embed diagram {diagram_file}: {e}", exc_info=True)
@@ -450,26 +772,131 @@ class PDFReportGenerator:
                 ))
                 story.append(Spacer(1, 0.1 * inch))
         
+        logger.info("Embedded %d of %d diagram(s): %s", len(embedded), len(selected_files), ', '.join(embedded))
+        
         # Note about additional diagrams
-        if len(diagram_files) > 4:
+        if extra_count:
             story.append(Paragraph(
-                f"<i>Note: {len(diagram_files) - 4} additional diagram(s) available in the generated-diagrams folder.</i>",
+                f"<i>Note: {extra_count} additional diagram(s) available in the generated-diagrams folder.</i>",
                 styles['body']
             ))
-            logger.info(f"Skipped {len(diagram_files) - 4} additional diagrams")
+            logger.info("Skipped %d additional diagrams", extra_count)
         
         story.append(Spacer(1, 0.2 * inch))
     
+    def _prepare_diagram(self, idx: int, entry: os.DirEntry) -> Dict[str, Any]:
+        """
+        Validate, measure and encode one diagram for embedding (runs on a worker thread)
+        
+        Args:
+            idx: 1-based position of the diagram in the report
+            entry: Directory entry for the diagram file
+            
+        Returns:
+            Dict with status ('ok', 'skipped', 'invalid' or 'error') and, when ok,
+            the title, encoded image data and display width/height
+        """
+        try:
+            diagram_file = entry.name
+            img_path = entry.path
+            
+            # Verify file exists and has content (stat result is cached on the entry)
+            try:
+                file_size = entry.stat().st_size
+            except FileNotFoundError:
+                logger.warning(f"Diagram file not found: {diagram_file}")
+                return {'status': 'skipped'}
+            
+            if file_size == 0:
+                logger.warning(f"Skipping empty file: {diagram_file}")
+                return {'status': 'skipped'}
+            
+            logger.debug("Embedding diagram %d: %s (%d bytes)", idx, diagram_file, file_size)
+            
+            # Read the header from the cached bytes to get dimensions and verify it's a valid image;
+            # PIL doesn't decode pixels for .size and the handle is closed right away
+            try:
+                with Image.open(BytesIO(self._get_image_bytes(img_path))) as pil_img:
+                    img_width, img_height = pil_img.size
+                logger.debug("Image dimensions: %dx%d", img_width, img_height)
+            except Exception as e:
+                logger.error(f"Failed to open image with PIL: {e}")
+                return {'status': 'invalid'}
+            
+            # Calculate dimensions to fit on page (max 6 inches wide, 4 inches high)
+            max_width = 6 * inch
+            max_height = 4 * inch
+            
+            # Scale down uniformly to fit the box (never up), which keeps the aspect ratio exact
+            scale = min(max_width / img_width, max_height / img_height, 1.0)
+            display_width = img_width * scale
+            display_height = img_height * scale
+            
+            logger.debug("Display dimensions: %.2fx%.2f inches", display_width / inch, display_height / inch)
+            
+            return {
+                'status': 'ok',
+                'title': diagram_file.replace('_', ' ').replace('.png', '').replace('.jpg', '').replace('.jpeg', '').title(),
+                'data': self._get_embed_bytes(img_path, img_width, img_height, display_width, display_height),
+                'width': display_width,
+                'height': display_height
+            }
+        
+        except Exception as e:
+            return {'status': 'error', 'error': e}
+    
+    def _get_image_bytes(self, img_path: str) -> bytes:
+        """Read a diagram from disk once; reportlab then shares one image object per unique content"""
+        image_data = self._image_cache.get(img_path)
+        if image_data is None:
+            with open(img_path, 'rb') as f:
+                image_data = f.read()
+            self._image_cache[img_path] = image_data
+        return image_data
+    
+    def _get_embed_bytes(self, img_path: str, img_width: int, img_height: int,
+                         display_width: float, display_height: float) -> bytes:
+        """
+        Get diagram bytes sized for embedding, downscaling images far larger than their display size
+        
+        Args:
+            img_path: Path to the diagram file
+            img_width: Source image width in pixels
+            img_height: Source image height in pixels
+            display_width: Width the image is drawn at, in points
+            display_height: Height the image is drawn at, in points
+            
+        Returns:
+            Encoded image bytes, resampled to DIAGRAM_EMBED_DPI when the source is larger
+        """
+        target_width = max(1, int(display_width / inch * DIAGRAM_EMBED_DPI))
+        target_height = max(1, int(display_height / inch * DIAGRAM_EMBED_DPI))
+        if img_width <= target_width and img_height <= target_height:
+            return self._get_image_bytes(img_path)
+        
+        key = (img_path, target_width, target_height)
+        image_data = self._resized_image_cache.get(key)
+        if image_data is None:
+            buffer = BytesIO()
+            with Image.open(BytesIO(self._get_image_bytes(img_path))) as pil_img:
+                pil_img.thumbnail((target_width, target_height), Image.LANCZOS)
+                # Images with transparency or a palette stay PNG
+                if pil_img.mode in ('RGB', 'L'):
+                    pil_img.save(buffer, 'JPEG', quality=DIAGRAM_JPEG_QUALITY, optimize=True)
+                else:
+                    pil_img.save(buffer, 'PNG', optimize=True)
+            image_data = buffer.getvalue()
+            self._resized_image_cache[key] = image_data
+            # Only the resampled copy is embedded; don't keep the full-resolution source alive
+            self._image_cache.pop(img_path, None)
+            logger.debug("Downscaled %s from %dx%d for embedding", os.path.basename(img_path), img_width, img_height)
+        return image_data
+    
     def _add_tco_analysis(self, story: List, styles: Dict):
         """Add TCO analysis section with properly formatted tables"""
-        from reportlab.platypus import Paragraph, Spacer, PageBreak, Table, TableStyle
-        from reportlab.lib import colors
-        from reportlab.lib.units import inch
-        import re
-        
         story.append(Paragraph("5. Total Cost of Ownership Analysis", styles['heading']))
         
-        tco_response = self.workflow_state['agent_responses'].get('tco', {})
+        tco_response = self._agents.get('tco', {})
         if not tco_response:
             story.append(Paragraph("No TCO analysis data available.", styles['body']))
             story.append(PageBreak())
@@ -479,417 +906,136 @@ class PDFReportGenerator:
         
         tco_text = str(tco_response.get('output', 'No TCO analysis available.'))
         
-        # Parse and format the TCO content
-        self._parse_and_format_tco_content(tco_text, story, styles)
+        # Clean markdown artifacts, then parse and format the TCO content
+        tco_text = self._clean_markdown_for_pdf(tco_text)
+        self._parse_and_format_content(tco_text, story, styles, code=False)
         
         story.append(PageBreak())
     
     def _clean_markdown_for_pdf(self, text: str) -> str:
         """Clean markdown artifacts and normalize text for PDF generation"""
-        import re
-        
-        # DON'T remove code block markers - we'll handle them in parsing
-        # Code blocks will be detected and formatted specially
-        
-        # Remove emojis - these render as ■ in PDFs
-        # This is a comprehensive emoji removal that handles:
-        # - Basic emojis (U+1F300-U+1F9FF)
-        # - Miscellaneous Symbols (U+2600-U+26FF) including ✅ ❌
-        # - Dingbats (U+2700-U+27BF)
-        # - Variation selectors (U+FE00-U+FE0F) that modify emojis
-        # - Emoji modifiers and components
-        text = re.sub(r'[\U0001F300-\U0001F9FF\u2600-\u26FF\u2700-\u27BF\uFE00-\uFE0F\U0001F1E0-\U0001F1FF\U0001FA70-\U0001FAFF]+', '', text)
-        
-        # Remove ALL box drawing characters, bullets, and special symbols
-        # Including Unicode ranges for box drawing (U+2500-U+257F) and geometric shapes (U+25A0-U+25FF)
-        text = re.sub(r'[\u2500-\u257F\u25A0-\u25FF\u2190-\u21FF]', '', text)
-        
-        # Also remove specific problematic characters
-        text = re.sub(r'[■□▪▫●○◆◇★☆✓✗✘]', '', text)
-        
-        # DO NOT remove markdown table separator lines here!
-        # The _add_formatted_table method needs them to identify headers correctly
-        # text = re.sub(r'^\|[\s\-:]+\|[\s\-:|]+$', '', text, flags=re.MULTILINE)
-        
-        # Remove lines that are just dashes or equals (markdown separators)
-        # But NOT table separators (which contain |)
-        text = re.sub(r'^[-=]{3,}$', '', text, flags=re.MULTILINE)
-        
-        # Remove HTML-style comments
-        text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
-        
-        # Remove bracket notation like [Data Scientists] that are part of diagrams
-        text = re.sub(r'\[([^\]]+)\]\s*\n', r'\1\n', text)
-        
-        # Keep # for headings but remove from other places
-        # Process line by line to preserve heading markers
-        lines = text.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            stripped = line.strip()
-            # If line starts with # and space/another #, it's a heading - keep it
-            if stripped.startswith('#') and len(stripped) > 1 and (stripped[1] == ' ' or stripped[1] == '#'):
-                cleaned_lines.append(line)
-            else:
-                # Remove # from non-heading lines
-                cleaned_lines.append(line.replace('#', ''))
-        text = '\n'.join(cleaned_lines)
-        
-        # Fix hard line breaks within paragraphs
-        # Split into lines and process
-        lines = text.split('\n')
-        cleaned_lines = []
-        i = 0
-        
-        while i < len(lines):
-            line = lines[i].rstrip()
-            
-            # Skip empty lines - preserve them
-            if not line:
-                cleaned_lines.append('')
-                i += 1
-                continue
-            
-            # Identify lines that should NOT be joined:
-            # 1. Headers (start with #)
-            # 2. Bullet points (start with •, -, *)
-            # 3. Table rows (contain |)
-            # 4. Lines ending with punctuation or special markers
-            is_header = line.startswith('#')
-            is_bullet = line.lstrip().startswith(('•', '- ', '* '))
-            is_table = '|' in line
-            ends_properly = line.endswith(('.', '!', '?', ')', '"', '**', ':', ','))
-            
-            if is_header or is_bullet or is_table:
-                cleaned_lines.append(line)
-                i += 1
-                continue
-            
-            # For regular text lines, join with next line if it's a continuation
-            if not ends_properly and i + 1 < len(lines):
-                next_line = lines[i + 1].strip()
-                # Check if next line is a continuation (not a header, bullet, or table)
-                if next_line and not next_line.startswith(('#', '•', '-', '*', '|')):
-                    # Join lines
-                    combined = line + ' ' + next_line
-                    i += 2
-                    
-                    # Keep joining while we have continuations
-                    while i < len(lines):
-                        current = lines[i].strip()
-                        if not current:
-                            break
-                        if current.startswith(('#', '•', '-', '*', '|')):
-                            break
-                        if combined.endswith(('.', '!', '?', ')', '"', '**', ':')):
-                            break
-                        combined = combined + ' ' + current
-                        i += 1
-                    
-                    cleaned_lines.append(combined)
-                else:
-                    cleaned_lines.append(line)
-                    i += 1
-            else:
-                cleaned_lines.append(line)
-                i += 1
-        
-        text = '\n'.join(cleaned_lines)
-        
-        # Remove excessive newlines
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        
-        # Clean up multiple spaces
-        text = re.sub(r' {2,}', ' ', text)
-        
-        # Remove empty lines with only whitespace
-        text = re.sub(r'^\s+$', '', text, flags=re.MULTILINE)
-        
-        # Remove trailing spaces
-        text = re.sub(r' +$', '', text, flags=re.MULTILINE)
-        
-        # Final pass: ensure no more than 2 consecutive newlines
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        
-        return text.strip()
+        return _clean_markdown(text)
     
-    def _parse_and_format_content(self, content: str, story: List, styles: Dict):
-        """Parse and format markdown content for PDF with proper structure"""
-        from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
-        from reportlab.lib.units import inch
-        from reportlab.lib.styles import ParagraphStyle
-        from reportlab.lib import colors
-        import re
-        
-        lines = content.split('\n')
-        i = 0
-        
-        while i < len(lines):
-            line = lines[i].strip()
-            
+    def _parse_and_format_content(self, content: str, story: List, styles: Dict, code: bool = True):
+        """
+        Parse and format markdown content for PDF with proper structure
+        
+        Args:
+            content: Cleaned markdown text
+            story: Flowable list to append to
+            styles: PDF styles from _create_styles
+            code: Render ``` fences as code blocks and `inline code` in Courier; TCO
+                output is formatted without them, leaving those markers as plain text
+        """
+        # Spacers are created per use on purpose: reportlab flags a flowable that doesn't
+        # fit at a page bottom as postponed and never clears it, so a shared instance
+        # hitting a second page bottom raises LayoutError
+        blocks = _tokenize_markdown_blocks(_iter_lines(content), code_blocks=code, tables='|' in content)
+        for kind, text in blocks:
             # Skip empty lines but add spacing
-            if not line:
+            if kind == 'blank':
                 story.append(Spacer(1, 0.1*inch))
-                i += 1
-                continue
-            
-            # Check for code blocks (```)
-            if line.startswith('```'):
-                # Extract code block
-                code_lines = []
-                language = line[3:].strip()  # Get language if specified
-                i += 1  # Skip opening ```
-                
-                while i < len(lines) and not lines[i].strip().startswith('```'):
-                    code_lines.append(lines[i])
-                    i += 1
-                
-                if i < len(lines):
-                    i += 1  # Skip closing ```
-                
-                # Add code block to PDF using a table with gray background
-                if code_lines:
-                    # Create a custom style for code with better wrapping
-                    code_para_style = ParagraphStyle(
-                        'CodeBlock',
-                        fontName='Courier',
-                        fontSize=7.5,  # Slightly smaller for better fit
-                        leading=9,
-                        leftIndent=0,
-                        rightIndent=0,
-                        wordWrap='CJK',  # Enable word wrapping
-                        splitLongWords=True,  # Allow breaking long words
-                        spaceBefore=0,
-                        spaceAfter=0
-                    )
-                    
-                    # Process each line
-                    code_paras = []
-                    for code_line in code_lines:
-                        # Escape HTML characters
-                        escaped_line = code_line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                        
-                        # Handle leading spaces for indentation
-                        # Count leading spaces
-                        leading_spaces = len(code_line) - len(code_line.lstrip())
-                        indent_text = '&nbsp;' * leading_spaces
-                        content_text = escaped_line.lstrip()
-                        
-                        # Create paragraph with proper indentation
-                        if content_text:
-                            para_text = f'{indent_text}{content_text}'
-                        else:
-                            para_text = '&nbsp;'  # Empty line
-                        
-                        code_paras.append(Paragraph(para_text, code_para_style))
-                    
-                    # Create table with gray background for code block
-                    # Use slightly wider column to accommodate more text
-                    code_table = Table([[para] for para in code_paras], colWidths=[6.3*inch])
-                    code_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F5F5F5')),
-                        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#CCCCCC')),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 12),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-                        ('TOPPADDING', (0, 0), (-1, -1), 10),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ]))
-                    
-                    story.append(Spacer(1, 0.15*inch))
-                    story.append(code_table)
-                    story.append(Spacer(1, 0.15*inch))
-                continue
-            
-            # Check for tables first (before headings, as tables can contain #)
-            if '|' in line and i + 1 < len(lines) and '|' in lines[i + 1]:
-                # Extract the table
-                table_lines = []
-                j = i
-                while j < len(lines) and '|' in lines[j]:
-                    table_lines.append(lines[j])
-                    j += 1
-                
-                # Parse and add the table
-                if len(table_lines) >= 1:  # At least one row
-                    self._add_formatted_table(table_lines, story, styles)
-                    story.append(Spacer(1, 0.2*inch))
-                
-                i = j
-            # Check for headings
-            elif line.startswith('###'):
-                heading_text = line.replace('###', '').strip()
-                # Remove ** markers from headings
-                heading_text = heading_text.replace('**', '')
-                story.append(Spacer(1, 0.15*inch))
-                story.append(Paragraph(f"<b>{heading_text}</b>", styles['subheading']))
-                story.append(Spacer(1, 0.1*inch))
-                i += 1
-            elif line.startswith('##'):
-                heading_text = line.replace('##', '').strip()
-                # Remove ** markers from headings
-                heading_text = heading_text.replace('**', '')
+            # Add code block to PDF using a table with gray background
+            elif kind == 'code':
+                if text:
+                    self._add_code_block(text, story)
+            elif kind == 'table':
+                self._add_formatted_table(text, story, styles)
                 story.append(Spacer(1, 0.2*inch))
-                story.append(Paragraph(f"<b>{heading_text}</b>", styles['heading']))
-                story.append(Spacer(1, 0.15*inch))
-                i += 1
-            elif line.startswith('#'):
-                heading_text = line.replace('#', '').strip()
+            # Headings: level from the number of leading # (### and deeper are subheadings)
+            elif kind == 'heading':
+                level = min(len(text) - len(text.lstrip('#')), 3)
+                marker, style_name, space_before, space_after = _HEADING_LAYOUT[level]
+                heading_text = text.replace(marker, '').strip()
                 # Remove ** markers from headings
                 heading_text = heading_text.replace('**', '')
-                story.append(Spacer(1, 0.2*inch))
-                story.append(Paragraph(f"<b>{heading_text}</b>", styles['heading']))
-                story.append(Spacer(1, 0.15*inch))
-                i += 1
-            # Check for bold text
-            elif line.startswith('**') and line.endswith('**'):
-                bold_text = line.replace('**', '').strip()
-                story.append(Paragraph(f"<b>{bold_text}</b>", styles['body']))
-                story.append(Spacer(1, 0.08*inch))
-                i += 1
-            # Check for bullet points
-            elif line.startswith('•') or line.startswith('- ') or line.startswith('* '):
-                bullet_text = re.sub(r'^[•\-\*]\s*', '', line).strip()
+                story.extend((
+                    Spacer(1, space_before*inch),
+                    Paragraph(f"<b>{heading_text}</b>", styles[style_name]),
+                    Spacer(1, space_after*inch)
+                ))
+            # Bold text
+            elif kind == 'bold':
+                bold_text = text.replace('**', '').strip()
+                story.extend((Paragraph(f"<b>{bold_text}</b>", styles['body']), Spacer(1, 0.08*inch)))
+            # Bullet points
+            elif kind == 'bullet':
+                # The line is already stripped and the prefix pattern eats the whitespace after the marker
+                bullet_text = _BULLET_PREFIX_RE.sub('', text)
                 # Remove any remaining ** markers from bullet text
-                bullet_text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', bullet_text)
+                if '**' in bullet_text:
+                    bullet_text = _BOLD_RE.sub(r'<b>\1</b>', bullet_text)
                 # Handle inline code in bullets
-                bullet_text = re.sub(r'`([^`]+)`', r'<font name="Courier" size="9">\1</font>', bullet_text)
-                story.append(Paragraph(f"• {bullet_text}", styles['body']))
-                story.append(Spacer(1, 0.05*inch))
-                i += 1
+                if code and '`' in bullet_text:
+                    bullet_text = _INLINE_CODE_RE.sub(r'<font name="Courier" size="9">\1</font>', bullet_text)
+                story.extend((Paragraph(f"• {bullet_text}", styles['body']), Spacer(1, 0.05*inch)))
             # Regular paragraph
             else:
-                # Handle inline bold text - convert ** to HTML bold tags
-                line = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', line)
-                # Remove any remaining standalone ** markers
-                line = line.replace('**', '')
+                # Plain lines skip the regexes below
+                line = text
+                if '**' in line:
+                    # Handle inline bold text - convert ** to HTML bold tags
+                    line = _BOLD_RE.sub(r'<b>\1</b>', line)
+                    # Remove any remaining standalone ** markers
+                    line = line.replace('**', '')
                 # Handle inline code (backticks)
-                line = re.sub(r'`([^`]+)`', r'<font name="Courier" size="9">\1</font>', line)
-                story.append(Paragraph(line, styles['body']))
-                story.append(Spacer(1, 0.08*inch))
-                i += 1
+                if code and '`' in line:
+                    line = _INLINE_CODE_RE.sub(r'<font name="Courier" size="9">\1</font>', line)
+                story.extend((Paragraph(line, styles['body']), Spacer(1, 0.08*inch)))
     
-    def _parse_and_format_tco_content(self, content: str, story: List, styles: Dict):
-        """Parse TCO content and format tables properly with markdown cleaning"""
-        from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
-        from reportlab.lib import colors
-        from reportlab.lib.units import inch
-        import re
-        
-        # Clean markdown artifacts first
-        content = self._clean_markdown_for_pdf(content)
-        
-        lines = content.split('\n')
-        i = 0
+    def _add_code_block(self, code_lines: List[str], story: List):
+        """Add a fenced code block as a single-column table with a gray background"""
+        # Create a custom style for code with better wrapping
+        code_para_style = ParagraphStyle(
+            'CodeBlock',
+            fontName='Courier',
+            fontSize=7.5,  # Slightly smaller for better fit
+            leading=9,
+            leftIndent=0,
+            rightIndent=0,
+            wordWrap='CJK',  # Enable word wrapping
+            splitLongWords=True,  # Allow breaking long words
+            spaceBefore=0,
+            spaceAfter=0
+        )
         
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Skip empty lines but add spacing
-            if not line:
-                story.append(Spacer(1, 0.1*inch))
-                i += 1
-                continue
-            
-            # Check if this is a markdown table (contains |)
-            if '|' in line and i + 1 < len(lines) and '|' in lines[i + 1]:
-                # Extract the table
-                table_lines = []
-                j = i
-                while j < len(lines) and '|' in lines[j]:
-                    table_lines.append(lines[j])
-                    j += 1
-                
-                # Parse and add the table
-                if len(table_lines) >= 2:  # At least header and separator
-                    self._add_formatted_table(table_lines, story, styles)
-                    story.append(Spacer(1, 0.2*inch))
-                
-                i = j
-            elif line.startswith('###'):
-                # Subheading
-                heading_text = line.replace('###', '').strip()
-                # Remove ** markers from headings
-                heading_text = heading_text.replace('**', '')
-                story.append(Spacer(1, 0.15*inch))
-                story.append(Paragraph(f"<b>{heading_text}</b>", styles['subheading']))
-                story.append(Spacer(1, 0.1*inch))
-                i += 1
-            elif line.startswith('##'):
-                # Section heading
-                heading_text = line.replace('##', '').strip()
-                # Remove ** markers from headings
-                heading_text = heading_text.replace('**', '')
-                story.append(Spacer(1, 0.2*inch))
-                story.append(Paragraph(f"<b>{heading_text}</b>", styles['heading']))
-                story.append(Spacer(1, 0.15*inch))
-                i += 1
-            elif line.startswith('#'):
-                # Main heading
-                heading_text = line.replace('#', '').strip()
-                # Remove ** markers from headings
-                heading_text = heading_text.replace('**', '')
-                story.append(Spacer(1, 0.2*inch))
-                story.append(Paragraph(f"<b>{heading_text}</b>", styles['heading']))
-                story.append(Spacer(1, 0.15*inch))
-                i += 1
-            elif line.startswith('**') and line.endswith('**'):
-                # Bold text
-                bold_text = line.replace('**', '').strip()
-                story.append(Paragraph(f"<b>{bold_text}</b>", styles['body']))
-                story.append(Spacer(1, 0.08*inch))
-                i += 1
-            elif line.startswith('•') or line.startswith('- ') or line.startswith('* '):
-                # Bullet point
-                bullet_text = re.sub(r'^[•\-\*]\s*', '', line).strip()
-                # Remove any remaining ** markers from bullet text
-                bullet_text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', bullet_text)
-                story.append(Paragraph(f"• {bullet_text}", styles['body']))
-                story.append(Spacer(1, 0.05*inch))
-                i += 1
+        # Process each line
+        code_paras = []
+        for code_line in code_lines:
+            # Escape HTML characters
+            escaped_line = html.escape(code_line, quote=False)
+        
+            # Handle leading spaces for indentation
+            # Count leading spaces
+            leading_spaces = len(code_line) - len(code_line.lstrip())
+            indent_text = _NBSP_CACHE[leading_spaces] if leading_spaces < len(_NBSP_CACHE) else '&nbsp;' * leading_spaces
+            content_text = escaped_line.lstrip()
+        
+            # Create paragraph with proper indentation
+            if content_text:
+                para_text = f'{indent_text}{content_text}'
             else:
-                # Regular paragraph - handle inline bold
-                line = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', line)
-                # Remove any remaining standalone ** markers
-                line = line.replace('**', '')
-                story.append(Paragraph(line, styles['body']))
-                story.append(Spacer(1, 0.08*inch))
-                i += 1
+                para_text = '&nbsp;'  # Empty line
+        
+            code_paras.append(Paragraph(para_text, code_para_style))
+        
+        # Create table with gray background for code block
+        # Use slightly wider column to accommodate more text
+        code_table = Table([[para] for para in code_paras], colWidths=[6.3*inch])
+        code_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), _CODE_BG_COLOR),
+            ('BOX', (0, 0), (-1, -1), 1, _CODE_BORDER_COLOR),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ]))
+        
+        story.extend((Spacer(1, 0.15*inch), code_table, Spacer(1, 0.15*inch)))
     
     def _add_formatted_table(self, table_lines: List[str], story: List, styles: Dict):
         """Convert markdown table to ReportLab table with proper formatting"""
-        from reportlab.platypus import Table, TableStyle, Paragraph
-        from reportlab.lib import colors
-        from reportlab.lib.units import inch
-        from reportlab.lib.styles import ParagraphStyle
-        import re
-        
-        # Create a style for table cells with text wrapping
-        cell_style = ParagraphStyle(
-            'TableCell',
-            fontSize=9,
-            leading=11,
-            wordWrap='CJK',
-            alignment=0  # Left align
-        )
-        
-        cell_style_right = ParagraphStyle(
-            'TableCellRight',
-            fontSize=9,
-            leading=11,
-            wordWrap='CJK',
-            alignment=2  # Right align
-        )
-        
-        header_style = ParagraphStyle(
-            'TableHeader',
-            fontSize=10,
-            leading=12,
-            wordWrap='CJK',
-            alignment=1,  # Center align
-            textColor=colors.whitesmoke
-        )
-        
         # Parse table data and track where separator was in original lines
         table_data = []
         separator_line_idx = None
@@ -911,19 +1057,7 @@ class PDFReportGenerator:
                 continue  # Skip adding separator to table_data
             
             # Clean each cell of markdown artifacts and special characters
-            cleaned_cells = []
-            for cell in cells:
-                # Remove box drawing characters
-                cell = re.sub(r'[─│┌┐└┘├┤┬┴┼═║╔╗╚╝╠╣╦╩╬■□▪▫●○◆◇★☆✓✗✘]', '', cell)
-                # Remove excessive spaces
-                cell = re.sub(r' {2,}', ' ', cell)
-                # Remove markdown bold markers but keep the text
-                cell = re.sub(r'\*\*(.*?)\*\*', r'\1', cell)
-                # Remove # from table cells
-                cell = cell.replace('#', '')
-                # Remove emoji symbols
-                cell = re.sub(r'[🟡❌✅]', '', cell)
-                cleaned_cells.append(cell.strip())
+            cleaned_cells = [_clean_table_cell(cell) for cell in cells]
             
             if cleaned_cells and any(c.strip() for c in cleaned_cells):
                 table_data.append(cleaned_cells)
@@ -951,22 +1085,16 @@ class PDFReportGenerator:
         # Ensure all rows have the same number of columns
         max_cols = max(len(row) for row in table_data)
         for row in table_data:
-            while len(row) < max_cols:
-                row.append('')
+            missing = max_cols - len(row)
+            if missing:
+                row.extend([''] * missing)
         
         # Determine column widths based on content
         num_cols = max_cols
         
         # Calculate appropriate column widths with more space
-        if num_cols == 5:
-            col_widths = [1.6*inch, 1.4*inch, 1.4*inch, 1.3*inch, 1.3*inch]
-        elif num_cols == 4:
-            col_widths = [2.2*inch, 1.6*inch, 1.6*inch, 1.6*inch]
-        elif num_cols == 3:
-            col_widths = [2.5*inch, 2*inch, 2*inch]
-        elif num_cols == 2:
-            col_widths = [3*inch, 3.5*inch]
-        else:
+        col_widths = _TABLE_COL_WIDTHS.get(num_cols)
+        if col_widths is None:
             # Equal width for other cases
             available_width = 6.5 * inch
             col_widths = [available_width / num_cols] * num_cols
@@ -974,77 +1102,40 @@ class PDFReportGenerator:
         # Header is always the first row in standard markdown tables
         # No need to reorder since we correctly identified it as row 0
         
-        # Convert text to Paragraph objects for proper wrapping
-        formatted_data = []
-        for row_idx, row in enumerate(table_data):
-            formatted_row = []
-            for col_idx, cell in enumerate(row):
-                if row_idx == header_row_idx:
-                    # Header row
-                    formatted_row.append(Paragraph(f"<b>{cell}</b>", header_style))
-                else:
-                    # Data rows - right align numeric columns (except first column)
-                    if col_idx == 0:
-                        formatted_row.append(Paragraph(cell, cell_style))
-                    else:
-                        formatted_row.append(Paragraph(cell, cell_style_right))
-            formatted_data.append(formatted_row)
+        # Convert text to Paragraph objects for proper wrapping: a bold header row, then
+        # data rows that right align numeric columns (except the first column)
+        header_style, cell_style, cell_style_right = _TABLE_HEADER_STYLE, _TABLE_CELL_STYLE, _TABLE_CELL_RIGHT_STYLE
+        formatted_data = [
+            [Paragraph(f"<b>{cell}</b>", header_style) for cell in row]
+            if row_idx == header_row_idx else
+            [Paragraph(row[0], cell_style)] + [Paragraph(cell, cell_style_right) for cell in row[1:]]
+            for row_idx, row in enumerate(table_data)
+        ]
         
         # Create table with formatted data
         table = Table(formatted_data, colWidths=col_widths, repeatRows=1)
         
-        # Apply styling
-        table_style = [
-            # Header row styling (always row 0 now after reordering)
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            
-            # Data rows styling
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            
-            # Grid and borders
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#2E86AB')),
-            
-            # Padding - increased for better spacing
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ]
-        
-        # Highlight subtotal/total rows
+        # Apply styling: shared base commands, then total-row highlights, which are
+        # emitted after ROWBACKGROUNDS so their background wins
+        table_style = list(_BASE_TABLE_STYLE)
         for row_idx, row in enumerate(table_data):
-            if row and any(keyword in str(row[0]).lower() for keyword in ['subtotal', 'total']):
+            # 'total' also matches subtotal rows
+            if 'total' in row[0].lower():
+                # Highlight subtotal/total rows
                 table_style.extend([
-                    ('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor('#F0F0F0')),
+                    ('BACKGROUND', (0, row_idx), (-1, row_idx), _TOTAL_ROW_COLOR),
                     ('FONTNAME', (0, row_idx), (-1, row_idx), 'Helvetica-Bold'),
-                    ('LINEABOVE', (0, row_idx), (-1, row_idx), 1.5, colors.HexColor('#2E86AB')),
+                    ('LINEABOVE', (0, row_idx), (-1, row_idx), 1.5, _PRIMARY_COLOR),
                 ])
         
-        # Alternate row colors for better readability (skip header and special rows)
-        for row_idx in range(1, len(table_data)):
-            row = table_data[row_idx]
-            if not any(keyword in str(row[0]).lower() for keyword in ['subtotal', 'total']):
-                if row_idx % 2 == 0:
-                    table_style.append(
-                        ('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor('#F8F9FA'))
-                    )
-        
         table.setStyle(TableStyle(table_style))
         story.append(table)
     
     def _add_migration_roadmap(self, story: List, styles: Dict):
         """Add migration roadmap section with proper markdown cleaning"""
-        from reportlab.platypus import Paragraph, Spacer, PageBreak
-        
         story.append(Paragraph("6. Migration Roadmap", styles['heading']))
         
-        navigator_response = self.workflow_state['agent_responses'].get('navigator', {})
+        navigator_response = self._agents.get('navigator', {})
         if navigator_response:
             story.append(Paragraph("6.1 Implementation Steps", styles['subheading']))
             
@@ -1062,37 +1153,5 @@ class PDFReportGenerator:
     
     def _add_implementation_recommendations(self, story: List, styles: Dict):
         """Add implementation recommendations"""
-        from reportlab.platypus import Paragraph, Spacer
-        
         story.append(Paragraph("7. Implementation Recommendations", styles['heading']))
-        
-        recommendations = """
-        <b>7.1 Pre-Migration Checklist</b><br/>
-        • Ensure all team members have appropriate AWS training<br/>
-        • Set up development and testing environments<br/>
-        • Establish backup and rollback procedures<br/>
-        • Create detailed project timeline with milestones<br/>
-        • Identify and mitigate potential risks<br/><br/>
-        
-        <b>7.2 Success Criteria</b><br/>
-        • All ML models successfully migrated to SageMaker<br/>
-        • Performance metrics meet or exceed current benchmarks<br/>
-        • Cost targets achieved as outlined in TCO analysis<br/>
-        • Team productivity maintained or improved<br/>
-        • Security and compliance requirements satisfied<br/><br/>
-        
-        <b>7.3 Post-Migration Activities</b><br/>
-        • Monitor system performance and costs<br/>
-        • Optimize resource utilization<br/>
-        • Implement advanced SageMaker features<br/>
-        • Conduct team training on new workflows<br/>
-        • Document lessons learned and best practices<br/><br/>
-        
-        <b>7.4 Support and Resources</b><br/>
-        • AWS Support: Consider upgrading to Business or Enterprise support<br/>
-        • AWS Professional Services: Engage for complex migration scenarios<br/>
-        • AWS Training: Enroll team in SageMaker certification programs<br/>
-        • Community: Join AWS ML community forums and user groups
-        """
-        
-        story.append(Paragraph(recommendations, styles['body']))
+        story.append(Paragraph(_RECOMMENDATIONS_HTML, styles['body']))
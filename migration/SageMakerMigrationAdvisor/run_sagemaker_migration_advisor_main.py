@@ -4,9 +4,9 @@ SageMaker Migration Advisor - Main Launcher
 Provides a dropdown menu to select between Lite and Regular modes
 """
 
+import os
 import sys
 import subprocess
-import threading
 from pathlib import Path
 
 try:
@@ -17,14 +17,58 @@ except ImportError:
     GUI_AVAILABLE = False
     print("Warning: tkinter not available. Falling back to CLI mode.")
 
+# Advisor scripts by display name, resolved once next to this launcher
+_SCRIPT_DIR = Path(__file__).resolve().parent
+_ADVISOR_SCRIPTS = {
+    "Migration Advisor Lite": _SCRIPT_DIR / "sagemaker_migration_advisor_lite.py",
+    "Migration Advisor Regular": _SCRIPT_DIR / "sagemaker_migration_advisor.py",
+}
+
+# Streamlit must survive this long after launch to count as started, checked every poll interval
+_STARTUP_GRACE_MS = 2000
+_STARTUP_POLL_MS = 250
+
+# Launcher window size in pixels; the height leaves room for the buttons
+_WINDOW_SIZE = (650, 550)
+
+# Mode descriptions shown under the dropdown
+_MODE_DESCRIPTIONS = {
+    "Migration Advisor Lite": (
+        "🎯 Quick Migration Assessment\n\n"
+        "Perfect for rapid evaluations and proof-of-concepts.\n\n"
+        "Features:\n"
+        "• Streamlined workflow with essential analysis\n"
+        "• Faster execution time (5-10 minutes)\n"
+        "• Core architecture analysis and recommendations\n"
+        "• Basic TCO estimation\n"
+        "• Simplified migration roadmap\n"
+        "• PDF report generation\n\n"
+        "Best for: Initial assessments, quick wins, and straightforward migrations"
+    ),
+    "Migration Advisor Regular": (
+        "🔬 Comprehensive Migration Analysis\n\n"
+        "Full-featured migration advisory with deep analysis.\n\n"
+        "Features:\n"
+        "• Complete multi-agent workflow\n"
+        "• Interactive Q&A session for clarifications\n"
+        "• Detailed architecture analysis\n"
+        "• Comprehensive TCO comparison\n"
+        "• Step-by-step migration roadmap\n"
+        "• Architecture diagrams generation\n"
+        "• Detailed PDF report with all findings\n\n"
+        "Best for: Complex migrations, enterprise deployments, and detailed planning"
+    )
+}
+
 
 class MigrationAdvisorLauncher:
     """GUI launcher for SageMaker Migration Advisor"""
     
     def __init__(self):
         self.root = tk.Tk()
+        # Build the window hidden and show it once fully laid out, so it is painted a single time
+        self.root.withdraw()
         self.root.title("SageMaker Migration Advisor Launcher")
-        self.root.geometry("650x550")  # Increased height to ensure buttons are visible
         self.root.resizable(False, False)
         
         # Track launch button for state management
@@ -39,11 +83,12 @@ class MigrationAdvisorLauncher:
         # Create UI
         self.create_widgets()
         
+        self.root.deiconify()
+        
     def center_window(self):
         """Center the window on screen"""
-        self.root.update_idletasks()
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
+        # Size is fixed, so no layout pass is needed to measure it (a withdrawn window reports 1x1 anyway)
+        width, height = _WINDOW_SIZE
         x = (self.root.winfo_screenwidth() // 2) - (width // 2)
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f'{width}x{height}+{x}+{y}')
@@ -114,10 +159,7 @@ class MigrationAdvisorLauncher:
         
         # Dropdown for mode selection
         self.mode_var = tk.StringVar(value="Migration Advisor Lite")
-        mode_options = [
-            "Migration Advisor Lite",
-            "Migration Advisor Regular"
-        ]
+        mode_options = list(_ADVISOR_SCRIPTS)
         
         self.mode_dropdown = ttk.Combobox(
             main_frame,
@@ -199,57 +241,20 @@ class MigrationAdvisorLauncher:
     
     def update_description(self):
         """Update description based on selected mode"""
-        mode = self.mode_var.get()
-        
-        descriptions = {
-            "Migration Advisor Lite": (
-                "🎯 Quick Migration Assessment\n\n"
-                "Perfect for rapid evaluations and proof-of-concepts.\n\n"
-                "Features:\n"
-                "• Streamlined workflow with essential analysis\n"
-                "• Faster execution time (5-10 minutes)\n"
-                "• Core architecture analysis and recommendations\n"
-                "• Basic TCO estimation\n"
-                "• Simplified migration roadmap\n"
-                "• PDF report generation\n\n"
-                "Best for: Initial assessments, quick wins, and straightforward migrations"
-            ),
-            "Migration Advisor Regular": (
-                "🔬 Comprehensive Migration Analysis\n\n"
-                "Full-featured migration advisory with deep analysis.\n\n"
-                "Features:\n"
-                "• Complete multi-agent workflow\n"
-                "• Interactive Q&A session for clarifications\n"
-                "• Detailed architecture analysis\n"
-                "• Comprehensive TCO comparison\n"
-                "• Step-by-step migration roadmap\n"
-                "• Architecture diagrams generation\n"
-                "• Detailed PDF report with all findings\n\n"
-                "Best for: Complex migrations, enterprise deployments, and detailed planning"
-            )
-        }
-        
-        self.desc_label.config(text=descriptions.get(mode, ""))
+        self.desc_label.config(text=_MODE_DESCRIPTIONS.get(self.mode_var.get(), ""))
     
     def launch_advisor(self):
-        """Launch the selected migration advisor in a separate thread"""
+        """Launch the selected migration advisor as a background process"""
         mode = self.mode_var.get()
         
         # Determine which script to run
-        if mode == "Migration Advisor Lite":
-            script_name = "sagemaker_migration_advisor_lite.py"
-            display_name = "Migration Advisor Lite"
-        else:
-            script_name = "sagemaker_migration_advisor.py"
-            display_name = "Migration Advisor Regular"
-        
-        # Get script path
-        script_path = Path(__file__).parent / script_name
+        display_name = mode if mode in _ADVISOR_SCRIPTS else "Migration Advisor Regular"
+        script_path = _ADVISOR_SCRIPTS[display_name]
         
         if not script_path.exists():
             messagebox.showerror(
                 "Error",
-                f"Script not found: {script_name}\n\nPlease ensure the file exists in the same directory."
+                f"Script not found: {script_path.name}\n\nPlease ensure the file exists in the same directory."
             )
             return
         
@@ -288,16 +293,10 @@ class MigrationAdvisorLauncher:
             "You can close this launcher or keep it open to monitor status."
         )
         
-        # Run in separate thread to keep GUI responsive
-        thread = threading.Thread(
-            target=self._run_advisor_thread,
-            args=(script_path, display_name),
-            daemon=True
-        )
-        thread.start()
+        self._start_advisor(script_path, display_name)
     
-    def _run_advisor_thread(self, script_path: Path, display_name: str):
-        """Run the advisor in a separate thread"""
+    def _start_advisor(self, script_path: Path, display_name: str):
+        """Start the advisor process and watch its startup from the Tk event loop"""
         try:
             # Check if streamlit is available
             import shutil
@@ -315,7 +314,7 @@ class MigrationAdvisorLauncher:
                     "  pip install streamlit\n\n"
                     "And that it's accessible from your command line."
                 )
-                self.root.after(0, self._on_advisor_error, error_msg, display_name)
+                self._on_advisor_error(error_msg, display_name)
                 return
             
             # Launch the selected advisor with Streamlit
@@ -326,7 +325,7 @@ class MigrationAdvisorLauncher:
             print(f"DEBUG: Script exists: {script_path.exists()}")
             print(f"{'='*60}\n")
             
-            # Use Popen for better control and non-blocking execution
+            # Popen returns immediately; the Tk loop polls it instead of a thread blocking on it
             process = subprocess.Popen(
                 [streamlit_path, "run", str(script_path)],
                 cwd=str(script_path.parent),
@@ -340,31 +339,10 @@ class MigrationAdvisorLauncher:
             print(f"DEBUG: Process started with PID: {process.pid}")
             print(f"DEBUG: Waiting for Streamlit to initialize...")
             
-            # Wait a moment for Streamlit to start
-            import time
-            time.sleep(2)
-            
-            # Check if process is still running
-            poll_result = process.poll()
-            if poll_result is not None:
-                # Process already exited - something went wrong
-                stdout, stderr = process.communicate()
-                error_msg = f"Streamlit exited immediately.\n\nStdout:\n{stdout}\n\nStderr:\n{stderr}"
-                print(f"DEBUG: Process exited with code {poll_result}")
-                print(f"DEBUG: Stdout: {stdout}")
-                print(f"DEBUG: Stderr: {stderr}")
-                self.root.after(0, self._on_advisor_error, error_msg, display_name)
-                return
-            
-            print(f"DEBUG: Streamlit appears to be running (PID: {process.pid})")
-            print(f"DEBUG: Browser should open automatically")
-            print(f"DEBUG: You can close this launcher window now\n")
-            
-            # Schedule success message in main thread
-            self.root.after(0, self._on_advisor_started, display_name, process.pid)
-            
-            # Don't wait for process to complete - let it run independently
-            # The user can close the launcher or keep it open
+            # Give Streamlit a moment to start before reporting success
+            self.root.after(
+                _STARTUP_POLL_MS, self._poll_advisor, process, display_name, _STARTUP_GRACE_MS - _STARTUP_POLL_MS
+            )
         
         except FileNotFoundError as e:
             # Streamlit not found
@@ -375,13 +353,37 @@ class MigrationAdvisorLauncher:
                 "pip install streamlit"
             )
             print(f"DEBUG: FileNotFoundError: {e}")
-            self.root.after(0, self._on_advisor_error, error_msg, display_name)
+            self._on_advisor_error(error_msg, display_name)
         except Exception as e:
-            # Schedule error handling in main thread
             print(f"DEBUG: Exception occurred: {type(e).__name__}: {e}")
             import traceback
             traceback.print_exc()
-            self.root.after(0, self._on_advisor_error, str(e), display_name)
+            self._on_advisor_error(str(e), display_name)
+    
+    def _poll_advisor(self, process: subprocess.Popen, display_name: str, remaining_ms: int):
+        """Check the starting advisor process (runs in main thread via Tk after())"""
+        poll_result = process.poll()
+        if poll_result is not None:
+            # Process already exited - something went wrong
+            stdout, stderr = process.communicate()
+            error_msg = f"Streamlit exited immediately.\n\nStdout:\n{stdout}\n\nStderr:\n{stderr}"
+            print(f"DEBUG: Process exited with code {poll_result}")
+            print(f"DEBUG: Stdout: {stdout}")
+            print(f"DEBUG: Stderr: {stderr}")
+            self._on_advisor_error(error_msg, display_name)
+            return
+        
+        if remaining_ms > 0:
+            self.root.after(_STARTUP_POLL_MS, self._poll_advisor, process, display_name, remaining_ms - _STARTUP_POLL_MS)
+            return
+        
+        print(f"DEBUG: Streamlit appears to be running (PID: {process.pid})")
+        print(f"DEBUG: Browser should open automatically")
+        print(f"DEBUG: You can close this launcher window now\n")
+        
+        # Don't wait for process to complete - let it run independently
+        # The user can close the launcher or keep it open
+        self._on_advisor_started(display_name, process.pid)
     
     def _on_advisor_started(self, display_name: str, pid: int):
         """Handle advisor successful start (runs in main thread)"""
@@ -456,47 +458,47 @@ def cli_launcher():
         choice = input("Enter your choice (1 or 2): ").strip()
         
         if choice == "1":
-            script_name = "sagemaker_migration_advisor_lite.py"
             display_name = "Migration Advisor Lite"
             break
         elif choice == "2":
-            script_name = "sagemaker_migration_advisor.py"
             display_name = "Migration Advisor Regular"
             break
         else:
             print("Invalid choice. Please enter 1 or 2.")
     
-    # Get script path
-    script_path = Path(__file__).parent / script_name
+    script_path = _ADVISOR_SCRIPTS[display_name]
     
     if not script_path.exists():
-        print(f"\n❌ Error: Script not found: {script_name}")
+        print(f"\n❌ Error: Script not found: {script_path.name}")
         print(f"   Please ensure the file exists in: {script_path.parent}")
         sys.exit(1)
     
     print(f"\n🚀 Launching {display_name}...\n")
     print("="*60 + "\n")
     
-    try:
-        # Launch the selected advisor with Streamlit
-        result = subprocess.run(
-            ["streamlit", "run", str(script_path)],
-            cwd=script_path.parent
-        )
-        
-        sys.exit(result.returncode)
+    command = ["streamlit", "run", str(script_path)]
     
+    try:
+        # Replace the launcher process with streamlit; nothing runs after it in CLI mode
+        os.chdir(str(script_path.parent))
+        sys.stdout.flush()
+        os.execvp(command[0], command)
     except FileNotFoundError:
         print("\n❌ Error: Streamlit is not installed or not in PATH")
         print("\nPlease install Streamlit:")
         print("  pip install streamlit")
         sys.exit(1)
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Interrupted by user")
-        sys.exit(130)
-    except Exception as e:
-        print(f"\n❌ Error launching {display_name}: {e}")
-        sys.exit(1)
+    except OSError:
+        # exec unavailable - fall back to running streamlit as a child process
+        try:
+            result = subprocess.run(command, cwd=script_path.parent)
+            sys.exit(result.returncode)
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Interrupted by user")
+            sys.exit(130)
+        except Exception as e:
+            print(f"\n❌ Error launching {display_name}: {e}")
+            sys.exit(1)
 
 
 def main():
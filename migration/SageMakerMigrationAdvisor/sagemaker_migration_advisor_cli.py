@@ -19,6 +19,7 @@ from strands_tools import http_request, image_reader, use_llm, load_tool
 from mcp import stdio_client, StdioServerParameters
 from logger_config import logger
 from strands.agent.conversation_manager import SlidingWindowConversationManager
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import os
 
@@ -106,7 +107,8 @@ try:
     bedrock_model = BedrockModel(
         model_id="us.anthropic.claude-sonnet-4-5-20250929-v1:0",  
         region_name='us-west-2',
-        temperature=0.0
+        temperature=0.0,
+        cache_prompt="default"  # static system prompts are reused by every agent call
     )
     logger.info("Using Claude 4.5 Sonnet model")
 except Exception as e:
@@ -116,7 +118,8 @@ except Exception as e:
         bedrock_model = BedrockModel(
             model_id="us.anthropic.claude-sonnet-4-20250514-v1:0",  
             region_name='us-west-2',
-            temperature=0.0
+            temperature=0.0,
+            cache_prompt="default"
         )
         logger.info("Using Claude 4 Sonnet model")
         
@@ -127,7 +130,8 @@ except Exception as e:
             bedrock_model = BedrockModel(
                 model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0",  
                 region_name='us-west-2',
-                temperature=0.0
+                temperature=0.0,
+                cache_prompt="default"
             )
             logger.info("Using Claude 3.7 Sonnet model in us-west-2")
         except Exception as e3:
@@ -207,28 +211,28 @@ write_agent_interaction("SageMaker Agent", sagemaker_input, sagemaker_descriptio
 
 
 #Arch diagram generation Agent
+# Diagram generation only needs the SageMaker design and never prompts the user, so it runs
+# in the background while the TCO and navigator agents work through the console
 
-domain_name_tools = MCPClient(lambda: stdio_client(
-    StdioServerParameters(command="uvx", args=["awslabs.aws-diagram-mcp-server"])
-))
-try:
+def generate_diagram(diagram_input):
+    domain_name_tools = MCPClient(lambda: stdio_client(
+        StdioServerParameters(command="uvx", args=["awslabs.aws-diagram-mcp-server"])
+    ))
     with domain_name_tools:
         tools = domain_name_tools.list_tools_sync()+[image_reader, use_llm, load_tool]
         diagram_generation_agent = Agent(
             model=bedrock_model,
             tools=tools,
             system_prompt=DIAGRAM_GENERATION_SYSTEM_PROMPT,
-            load_tools_from_directory=False
+            load_tools_from_directory=False,
+            # Don't stream into the console the foreground agents are using
+            callback_handler=None
         )
-        diagram_input = str(sagemaker_description)+ "\n"+DIAGRAM_GENERATION_USER_PROMPT
-        diagram = diagram_generation_agent(diagram_input)
-        write_agent_interaction("Diagram Generation Agent", diagram_input, diagram)
-except Exception as e:
-    logger.error(f"Diagram generation failed: {e}")
-    diagram = "Diagram generation failed due to image size constraints or model limitations. Please check the generated-diagrams folder for any partial outputs."
-    write_agent_interaction("Diagram Generation Agent", diagram_input, f"ERROR: {diagram}")
-    print(f"⚠️ Diagram generation failed: {e}")
-    print("Continuing with remaining agents...")
+        return diagram_generation_agent(diagram_input)
+
+diagram_input = str(sagemaker_description)+ "\n"+DIAGRAM_GENERATION_USER_PROMPT
+diagram_executor = ThreadPoolExecutor(max_workers=1)
+diagram_future = diagram_executor.submit(generate_diagram, diagram_input)
 
 #TCO Agent
 
@@ -261,6 +265,21 @@ print("Architecture Navigator:", architecture_navigator)
 logger.info("Architecture Navigator response: %s", architecture_navigator)
 
 
+#Collect the background diagram generation result
+
+try:
+    diagram = diagram_future.result()
+    write_agent_interaction("Diagram Generation Agent", diagram_input, diagram)
+    print("Diagram generation complete. Check the generated-diagrams folder.")
+except Exception as e:
+    logger.error(f"Diagram generation failed: {e}")
+    diagram = "Diagram generation failed due to image size constraints or model limitations. Please check the generated-diagrams folder for any partial outputs."
+    write_agent_interaction("Diagram Generation Agent", diagram_input, f"ERROR: {diagram}")
+    print(f"⚠️ Diagram generation failed: {e}")
+finally:
+    diagram_executor.shutdown()
+
+
 #Optional:  Uncomment the following section if you need to generated cloudformationt template
 
 """
@@ -139,7 +139,8 @@ class SageMakerAdvisorApp:
                     region_name='us-west-2',
                     temperature=0.0,
                     max_tokens=lite_max_tokens,
-                    boto_client_config=bedrock_timeout_config
+                    boto_client_config=bedrock_timeout_config,
+                    cache_prompt="default"  # static system prompts are reused by every agent call
                 )
                 st.session_state.model_name = "Claude 4.5 Sonnet"
             except Exception as e:
@@ -149,7 +150,8 @@ class SageMakerAdvisorApp:
                         region_name='us-west-2',
                         temperature=0.0,
                         max_tokens=lite_max_tokens,
-                        boto_client_config=bedrock_timeout_config
+                        boto_client_config=bedrock_timeout_config,
+                        cache_prompt="default"
                     )
                     st.session_state.model_name = "Claude 4 Sonnet"
                 except Exception as e2:
@@ -159,7 +161,8 @@ class SageMakerAdvisorApp:
                             region_name='us-west-2',
                             temperature=0.0,
                             max_tokens=lite_max_tokens,
-                            boto_client_config=bedrock_timeout_config
+                            boto_client_config=bedrock_timeout_config,
+                            cache_prompt="default"
                         )
                         st.session_state.model_name = "Claude 3.7 Sonnet"
                     except Exception as e3:
@@ -1285,7 +1288,8 @@ This information provides a solid foundation for designing the SageMaker migrati
                     workspace_dir=workspace_dir,
                     bedrock_model=st.session_state.bedrock_model,
                     system_prompt=DIAGRAM_GENERATION_SYSTEM_PROMPT,
-                    user_prompt=DIAGRAM_GENERATION_USER_PROMPT
+                    user_prompt=DIAGRAM_GENERATION_USER_PROMPT,
+                    prefetch_tools=False
                 )
                 
                 diagram_files = diagram_gen._list_diagram_files()
@@ -0,0 +1,101 @@
+"""Tests for the shared diagram MCP server connection."""
+
+import os
+import signal
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("strands")
+pytest.importorskip("strands_tools")
+from mcp import StdioServerParameters
+
+import diagram_generator
+from diagram_generator import DiagramGenerator
+
+
+PID_SERVER = '''
+import os
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("pid")
+
+
+@mcp.tool()
+def server_pid() -> int:
+    """Return the server process id"""
+    return os.getpid()
+
+
+mcp.run()
+'''
+
+
+class FakeAgent:
+    """Stands in for the Bedrock agent: calls the MCP server and optionally writes a diagram."""
+
+    pids = []
+    write_diagram = True
+    diagram_folder = None
+
+    def __init__(self, tools, **kwargs):
+        self.tools = tools
+        self.messages = []
+
+    def __call__(self, prompt):
+        tool = next(t for t in self.tools if getattr(t, "tool_name", None) == "server_pid")
+        result = tool.mcp_client.call_tool_sync("pid-call", "server_pid", {})
+        assert result["status"] == "success"
+        FakeAgent.pids.append(int(result["content"][0]["text"]))
+        if FakeAgent.write_diagram:
+            with open(os.path.join(FakeAgent.diagram_folder, f"diagram-{len(FakeAgent.pids)}.png"), "wb") as f:
+                f.write(b"png")
+        return "done"
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    """A generator wired to a local pid-reporting MCP server and a fake agent."""
+    script = tmp_path / "pid_server.py"
+    script.write_text(PID_SERVER)
+    monkeypatch.setattr(
+        diagram_generator, "_MCP_SERVER",
+        StdioServerParameters(command=sys.executable, args=[str(script)]),
+    )
+    monkeypatch.setattr(diagram_generator, "Agent", FakeAgent)
+    monkeypatch.setattr(FakeAgent, "pids", [])
+    monkeypatch.setattr(FakeAgent, "write_diagram", True)
+
+    gen = DiagramGenerator(str(tmp_path), None, "system", "user", prefetch_tools=False)
+    gen.diagram_folder = str(tmp_path / "diagrams")
+    os.makedirs(gen.diagram_folder)
+    monkeypatch.setattr(FakeAgent, "diagram_folder", gen.diagram_folder)
+    diagram_generator.close_mcp_client()
+    yield gen
+    diagram_generator.close_mcp_client()
+
+
+def test_killed_server_is_restarted_on_next_run(generator):
+    assert generator.generate_diagram("arch")["status"] == "success"
+    first_pid = FakeAgent.pids[-1]
+
+    os.kill(first_pid, signal.SIGKILL)
+    time.sleep(0.5)
+
+    assert generator.generate_diagram("arch")["status"] == "success"
+    assert FakeAgent.pids[-1] != first_pid
+
+
+def test_live_server_is_reused(generator):
+    generator.generate_diagram("arch")
+    generator.generate_diagram("arch")
+
+    assert FakeAgent.pids[0] == FakeAgent.pids[1]
+
+
+def test_run_without_diagrams_resets_server(generator):
+    FakeAgent.write_diagram = False
+
+    assert generator.generate_diagram("arch")["status"] == "no_files"
+    assert diagram_generator._mcp_client is None